@@ -1,6 +1,8 @@
+import copy
 import inspect
-import json as json_module
 import logging
+import mmap
+import os
 from functools import partialmethod
 from functools import wraps
 from http import client
@@ -31,6 +33,18 @@ from requests.adapters import MaxRetryError
 from requests.exceptions import ConnectionError
 from requests.exceptions import RetryError
 
+from responses import _json
+from responses._json import JSONBackend
+from responses._json import get_json_backend
+from responses._json import set_json_backend
+from responses._network import NetworkConditions
+from responses._network import ThrottledBody
+from responses._request import ParsedURL
+from responses._request import SpooledBody
+from responses._request import _get_url_and_path
+from responses._request import get_parsed_body
+from responses._request import get_parsed_url
+from responses.matchers import MatcherStats
 from responses.matchers import json_params_matcher as _json_params_matcher
 from responses.matchers import query_string_matcher as _query_string_matcher
 from responses.matchers import urlencoded_params_matcher as _urlencoded_params_matcher
@@ -41,22 +55,23 @@ try:
 except ImportError:  # pragma: no cover
     from typing import Literal
 
+from io import SEEK_CUR
+from io import SEEK_END
+from io import SEEK_SET
 from io import BufferedReader
 from io import BytesIO
+from io import RawIOBase
 from unittest import mock as std_mock
 from urllib.parse import parse_qsl
 from urllib.parse import quote
 from urllib.parse import urlsplit
-from urllib.parse import urlunparse
 from urllib.parse import urlunsplit
 
 from urllib3.response import HTTPHeaderDict
 from urllib3.response import HTTPResponse
-from urllib3.util.url import parse_url
 
 if TYPE_CHECKING:  # pragma: no cover
     # import only for linter run
-    import os
     from typing import Protocol
     from unittest.mock import _patch as _mock_patcher
 
@@ -64,6 +79,8 @@ if TYPE_CHECKING:  # pragma: no cover
     from requests import models
     from urllib3 import Retry as _Retry
 
+    from responses.matchers import _Reason
+
     class UnboundSend(Protocol):
         def __call__(
             self,
@@ -75,7 +92,21 @@ if TYPE_CHECKING:  # pragma: no cover
             ...
 
     # Block of type annotations
-    _Body = Union[str, BaseException, "Response", BufferedReader, bytes, None]
+    _Chunks = Iterable[Union[bytes, str]]
+    _Body = Union[
+        str,
+        BaseException,
+        "Response",
+        BufferedReader,
+        bytes,
+        _Chunks,
+        Callable[[], _Chunks],
+        "os.PathLike[str]",
+        None,
+    ]
+    _RawBody = Union[
+        BufferedReader, BytesIO, "_IterableBody", "_BufferReader", ThrottledBody
+    ]
     _F = Callable[..., Any]
     _HeaderSet = Optional[Union[Mapping[str, str], List[Tuple[str, str]]]]
     _MatcherIterable = Iterable[Callable[..., Tuple[bool, str]]]
@@ -296,91 +327,229 @@ def _ensure_url_default_path(
     return url
 
 
-def _get_url_and_path(url: str) -> str:
-    """Construct URL only containing scheme, netloc and path by truncating other parts.
+class _BodyReader(BytesIO):
+    """Body of a mocked response.
 
-    This method complies with RFC 3986.
+    ``BytesIO`` created from ``bytes`` shares their buffer until it is written to,
+    thus a body encoded once is served to any number of calls without copies.
+    """
 
-    Examples
-    --------
-    >>> _get_url_and_path("http://example.com/path;segment?ab=xy&zed=qwe#test=1&foo=bar")
-    "http://example.com/path;segment"
+    def isclosed(self) -> bool:
+        """
+        Real Response uses HTTPResponse as body object.
+        Thus, when method is_closed is called first to check if there is any more
+        content to consume and the file-like object is still opened
 
+        This method ensures stability to work for both:
+        https://github.com/getsentry/responses/issues/438
+        https://github.com/getsentry/responses/issues/394
 
-    Parameters
-    ----------
-    url : str
-        URL to parse.
+        where file should be intentionally be left opened to continue consumption
+        """
+        if not self.closed and self.read(1):
+            # if there is more bytes to read then keep open, but return pointer
+            self.seek(-1, 1)
+            return False
+        else:
+            if not self.closed:
+                # close but return False to mock like is still opened
+                self.close()
+                return False
 
-    Returns
-    -------
-    url : str
-        URL with scheme, netloc and path
+            # only if file really closed (by us) return True
+            return True
 
+
+class _IterableBody(RawIOBase):
+    """Body of a mocked response produced by an iterable of chunks.
+
+    Chunks are pulled from the iterable while the body is read, thus only the chunk
+    being read is kept in memory. ``str`` chunks are encoded with UTF-8.
     """
-    url_parsed = urlsplit(url)
-    url_and_path = urlunparse(
-        [url_parsed.scheme, url_parsed.netloc, url_parsed.path, None, None, None]
-    )
-    return parse_url(url_and_path).url
+
+    def __init__(self, chunks: "_Chunks") -> None:
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> bool:
+        """Pull chunks until there are pending bytes, ``False`` when exhausted."""
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return False
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            try:
+                self._pending = memoryview(chunk).cast("B")
+            except TypeError:
+                raise TypeError(
+                    "chunks of an iterable response body must be bytes or str, "
+                    f"not {type(chunk).__name__}"
+                ) from None
+        return True
+
+    def isclosed(self) -> bool:
+        """Report the exhausted body as closed, see ``_BodyReader.isclosed``.
+
+        Otherwise urllib3 keeps reading when no chunk size is set.
+        """
+        return self.closed or not self._fill()
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._fill():
+            return 0
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            # run the cleanup of a generator that wasn't consumed to the end
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+        super().close()
+
+
+class _BufferReader(RawIOBase):
+    """Reader over a buffer shared by all calls, e.g. a memory-mapped file.
+
+    Every call reads the buffer at its own position, the buffer isn't copied.
+    """
+
+    def __init__(self, buffer: "Union[bytes, mmap.mmap]") -> None:
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        start = self._position
+        data = self._view[start : start + len(buffer)]  # noqa: E203
+        size = len(data)
+        buffer[:size] = data
+        self._position = start + size
+        return size
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def isclosed(self) -> bool:
+        """Report the exhausted body as closed, see ``_IterableBody.isclosed``."""
+        return self.closed or self._position >= len(self._view)
+
+    def close(self) -> None:
+        if not self.closed:
+            # the mapping can't be closed while a view of it exists
+            self._view.release()
+        super().close()
+
+
+def _file_signature(stat: os.stat_result) -> Tuple[int, int]:
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _map_file(
+    path: "os.PathLike[str]",
+) -> "Tuple[Union[bytes, mmap.mmap], Tuple[int, int]]":
+    """Memory-map the file read-only, the pages are shared by every reader.
+
+    Returns the mapping and the size and modification time of the mapped file,
+    see ``_file_signature``. Empty files can't be mapped, an empty ``bytes`` is
+    returned instead.
+    """
+    with open(path, "rb") as f:
+        signature = _file_signature(os.fstat(f.fileno()))
+        if signature[0] == 0:
+            return b"", signature
+        # the mapping stays valid after the file is closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), signature
+
+
+def _is_buffer(body: Any) -> bool:
+    """Check that the body supports the buffer protocol, e.g. ``memoryview``."""
+    try:
+        memoryview(body)
+    except TypeError:
+        return False
+    return True
 
 
 def _handle_body(
-    body: Optional[Union[bytes, BufferedReader, str]]
-) -> Union[BufferedReader, BytesIO]:
+    body: "_Body",
+) -> "_RawBody":
     """Generates `Response` body.
 
     Parameters
     ----------
-    body : str or bytes or BufferedReader
-        Input data to generate `Response` body.
+    body : str or bytes or BufferedReader or iterable or callable or os.PathLike
+        Input data to generate `Response` body. An iterable of ``bytes`` or ``str``
+        chunks is streamed, a callable is called to create the iterable. The file at
+        a path is memory-mapped.
 
     Returns
     -------
-    body : BufferedReader or BytesIO
+    body : BufferedReader or BytesIO or _IterableBody or _BufferReader
         `Response` body
 
     """
+    if callable(body):
+        # a factory creates new chunks for every call of the response
+        body = body()
     if isinstance(body, str):
         body = body.encode("utf-8")
     if isinstance(body, BufferedReader):
         return body
+    if isinstance(body, os.PathLike):
+        mapped, _ = _map_file(body)
+        if isinstance(mapped, mmap.mmap):
+            return _BufferReader(mapped)
+        body = mapped
+    if body is None:
+        return _BodyReader(b"")
+    if _is_buffer(body):
+        return _BodyReader(body)  # type: ignore[arg-type]
+    if isinstance(body, Mapping) or not isinstance(body, Iterable):
+        raise TypeError(
+            "response body must be str, bytes, a file, a path or an iterable of "
+            f"bytes or str chunks, not {type(body).__name__}"
+        )
 
-    data = BytesIO(body)  # type: ignore[arg-type]
-
-    def is_closed() -> bool:
-        """
-        Real Response uses HTTPResponse as body object.
-        Thus, when method is_closed is called first to check if there is any more
-        content to consume and the file-like object is still opened
-
-        This method ensures stability to work for both:
-        https://github.com/getsentry/responses/issues/438
-        https://github.com/getsentry/responses/issues/394
-
-        where file should be intentionally be left opened to continue consumption
-        """
-        if not data.closed and data.read(1):
-            # if there is more bytes to read then keep open, but return pointer
-            data.seek(-1, 1)
-            return False
-        else:
-            if not data.closed:
-                # close but return False to mock like is still opened
-                data.close()
-                return False
+    return _IterableBody(body)  # type: ignore[arg-type]
 
-            # only if file really closed (by us) return True
-            return True
 
-    data.isclosed = is_closed  # type: ignore[attr-defined]
-    return data
+def _set_streaming_headers(headers: HTTPHeaderDict) -> None:
+    """Mark a body of unknown length as chunked, as a streaming server does."""
+    if "Content-Length" not in headers and "Transfer-Encoding" not in headers:
+        headers["Transfer-Encoding"] = "chunked"
 
 
 class BaseResponse:
     passthrough: bool = False
-    content_type: Optional[str] = None
-    headers: Optional[Mapping[str, str]] = None
+    _content_type: Optional[str] = None
+    _headers: Optional[Mapping[str, str]] = None
+    _headers_cache: Optional[HTTPHeaderDict] = None
+    _mapped_signature: Optional[Tuple[int, int]] = None
+    # incremented when ``url`` or ``method`` of any response is reassigned,
+    # registries then update their lookup structures, see ``FirstMatchRegistry``
+    _routing_changes: int = 0
     stream: Optional[bool] = False
 
     def __init__(
@@ -391,10 +560,11 @@ class BaseResponse:
         match: "_MatcherIterable" = (),
         *,
         passthrough: bool = False,
+        network_conditions: Optional[NetworkConditions] = None,
     ) -> None:
-        self.method: str = method
+        self.method = method
         # ensure the url has a default path set if the url is a string
-        self.url: "_URLPatternType" = _ensure_url_default_path(url)
+        self.url = _ensure_url_default_path(url)
 
         if self._should_match_querystring(match_querystring):
             match = tuple(match) + (
@@ -404,9 +574,10 @@ class BaseResponse:
         self.match: "_MatcherIterable" = match
         self._calls: CallList = CallList()
         self.passthrough = passthrough
+        self.network_conditions = network_conditions
 
         self.status: int = 200
-        self.body: "_Body" = ""
+        self.body = ""
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, BaseResponse):
@@ -426,6 +597,128 @@ class BaseResponse:
     def __ne__(self, other: Any) -> bool:
         return not self.__eq__(other)
 
+    def _duplicate(self) -> "BaseResponse":
+        """Copy of the response that can be registered once more.
+
+        The copy shares the registered state, such as body, headers and matchers,
+        with the original response, but records its calls separately. Reassigning an
+        attribute of the copy doesn't affect the original response.
+        """
+        duplicate = copy.copy(self)
+        duplicate._calls = CallList()
+        return duplicate
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @method.setter
+    def method(self, value: str) -> None:
+        if "_method" in vars(self):
+            BaseResponse._routing_changes += 1
+        self._method = value
+
+    @property
+    def url(self) -> "_URLPatternType":
+        return self._url
+
+    @url.setter
+    def url(self, value: "_URLPatternType") -> None:
+        if "_url" in vars(self):
+            BaseResponse._routing_changes += 1
+        self._url = value
+        # invalidate normalized URL, see `_get_url_and_path_cached`
+        self._url_and_path: Optional[str] = None
+
+    @property
+    def body(self) -> "_Body":
+        return self._body
+
+    @body.setter
+    def body(self, value: "_Body") -> None:
+        self._body = value
+        # invalidate encoded body, see `_get_encoded_body`
+        self._encoded_body: Optional[Union[bytes, mmap.mmap]] = None
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self._content_type
+
+    @content_type.setter
+    def content_type(self, value: Optional[str]) -> None:
+        self._content_type = value
+        # invalidate computed headers, see `get_headers`
+        self._headers_cache = None
+
+    @property
+    def headers(self) -> Optional[Mapping[str, str]]:
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: Optional[Mapping[str, str]]) -> None:
+        self._headers = value
+        # invalidate computed headers, see `get_headers`
+        self._headers_cache = None
+
+    def _apply_network_conditions(
+        self, request: "PreparedRequest", body: "_RawBody"
+    ) -> "_RawBody":
+        """Wait for the first byte and throttle the body, see ``NetworkConditions``.
+
+        The conditions of the response take precedence over the ones of the mock.
+        """
+        conditions = self.network_conditions
+        if conditions is None:
+            conditions = vars(request).get("network_conditions")
+            if conditions is None:
+                return body
+
+        conditions.wait(request)
+        if conditions.bandwidth:
+            return ThrottledBody(body, conditions.bandwidth)
+        return body
+
+    def _get_encoded_body(self) -> Optional[Union[bytes, mmap.mmap]]:
+        """Body encoded to bytes once and shared by all calls.
+
+        The file at an ``os.PathLike`` body is memory-mapped instead. The file is
+        mapped again when its size or modification time changes, reading a mapping
+        of a truncated file would crash the interpreter.
+        Returns ``None`` for bodies that aren't ``str``, ``bytes``, ``os.PathLike``
+        or ``None``.
+        """
+        body = self._body
+        if (
+            isinstance(body, os.PathLike)
+            and self._encoded_body is not None
+            and _file_signature(os.stat(body)) != self._mapped_signature
+        ):
+            # the mapping is closed once the readers of previous calls are closed
+            self._encoded_body = None
+        if self._encoded_body is None:
+            if isinstance(body, str):
+                self._encoded_body = body.encode("utf-8")
+            elif isinstance(body, bytes):
+                self._encoded_body = body
+            elif isinstance(body, os.PathLike):
+                self._encoded_body, self._mapped_signature = _map_file(body)
+            elif body is None:
+                self._encoded_body = b""
+        return self._encoded_body
+
+    def _get_url_and_path_cached(self) -> str:
+        """Normalized scheme, netloc and path of the registered string URL.
+
+        The registered URL is normalized on first use instead of on every comparison.
+        """
+        if self._url_and_path is None:
+            url = self._url
+            assert isinstance(url, str)
+            if _has_unicode(url):
+                url = _clean_unicode(url)
+            self._url_and_path = _get_url_and_path(url)
+        return self._url_and_path
+
     def _should_match_querystring(
         self, match_querystring_argument: Union[bool, object]
     ) -> Union[bool, object]:
@@ -468,10 +761,16 @@ class BaseResponse:
 
         """
         if isinstance(url, str):
-            if _has_unicode(url):
-                url = _clean_unicode(url)
+            if url is self._url:
+                url_and_path = self._get_url_and_path_cached()
+            else:
+                if _has_unicode(url):
+                    url = _clean_unicode(url)
+                url_and_path = _get_url_and_path(url)
 
-            return _get_url_and_path(url) == _get_url_and_path(other)
+            if isinstance(other, ParsedURL):
+                return url_and_path == other.url_and_path
+            return url_and_path == _get_url_and_path(other)
 
         elif isinstance(url, Pattern) and url.match(other):
             return True
@@ -482,7 +781,11 @@ class BaseResponse:
     @staticmethod
     def _req_attr_matches(
         match: "_MatcherIterable", request: "PreparedRequest"
-    ) -> Tuple[bool, str]:
+    ) -> Tuple[bool, "_Reason"]:
+        matcher_stats = vars(request).get("matcher_stats")
+        if matcher_stats is not None:
+            return matcher_stats.evaluate(match, request)
+
         for matcher in match:
             valid, reason = matcher(request)
             if not valid:
@@ -491,28 +794,46 @@ class BaseResponse:
         return True, ""
 
     def get_headers(self) -> HTTPHeaderDict:
-        headers = HTTPHeaderDict()  # Duplicate headers are legal
+        """Headers of the response, computed once and copied for every call.
 
-        # Add Content-Type if it exists and is not already in headers
-        if self.content_type and (
-            not self.headers or "Content-Type" not in self.headers
-        ):
-            headers["Content-Type"] = self.content_type
+        The computed headers are invalidated when ``headers`` or ``content_type``
+        is reassigned. Mutating the ``headers`` mapping in place isn't detected,
+        assign the mapping again to apply the change.
+        """
+        if self._headers_cache is None:
+            headers = HTTPHeaderDict()  # Duplicate headers are legal
 
-        # Extend headers if they exist
-        if self.headers:
-            headers.extend(self.headers)
+            # Add Content-Type if it exists and is not already in headers
+            if self.content_type and (
+                not self.headers or "Content-Type" not in self.headers
+            ):
+                headers["Content-Type"] = self.content_type
+
+            # Extend headers if they exist
+            if self.headers:
+                headers.extend(self.headers)
 
-        return headers
+            self._headers_cache = headers
+
+        # the caller may modify the headers, e.g. to add Content-Length
+        return self._headers_cache.copy()
 
     def get_response(self, request: "PreparedRequest") -> HTTPResponse:
         raise NotImplementedError
 
     def matches(self, request: "PreparedRequest") -> Tuple[bool, str]:
+        valid, reason = self._matches(request)
+        return valid, str(reason)
+
+    def _matches(self, request: "PreparedRequest") -> Tuple[bool, "_Reason"]:
+        """Logic of ``matches`` that returns ``LazyReason`` of matchers unformatted.
+
+        Registries use it to format only the reasons that are reported.
+        """
         if request.method != self.method:
             return False, "Method does not match"
 
-        if not self._url_matches(self.url, str(request.url)):
+        if not self._url_matches(self.url, get_parsed_url(request)):
             return False, "URL does not match"
 
         valid, reason = self._req_attr_matches(self.match, request)
@@ -531,7 +852,7 @@ class BaseResponse:
 
 
 def _form_response(
-    body: Union[BufferedReader, BytesIO],
+    body: "_RawBody",
     headers: Optional[Mapping[str, str]],
     status: int,
     request_method: Optional[str],
@@ -593,7 +914,7 @@ class Response(BaseResponse):
         # override the body and content_type
         if json is not None:
             assert not body
-            body = json_module.dumps(json)
+            body = _json.dumps(json)
             if content_type is _UNSET:
                 content_type = "application/json"
 
@@ -603,9 +924,9 @@ class Response(BaseResponse):
             else:
                 content_type = "text/plain"
 
-        self.body: "_Body" = body
+        self.body = body
         self.status: int = status
-        self.headers: Optional[Mapping[str, str]] = headers
+        self.headers = headers
 
         if stream is not None:
             warn(
@@ -614,7 +935,7 @@ class Response(BaseResponse):
             )
 
         self.stream: Optional[bool] = stream
-        self.content_type: str = content_type  # type: ignore[assignment]
+        self.content_type = content_type  # type: ignore[assignment]
         self.auto_calculate_content_length: bool = auto_calculate_content_length
 
     def get_response(self, request: "PreparedRequest") -> HTTPResponse:
@@ -626,16 +947,31 @@ class Response(BaseResponse):
         status = self.status
 
         assert not isinstance(self.body, (Response, BaseException))
-        body = _handle_body(self.body)
+        encoded_body = self._get_encoded_body()
+        body: "_RawBody"
+        content_length: Optional[int] = None
+        if isinstance(encoded_body, mmap.mmap):
+            body = _BufferReader(encoded_body)
+            content_length = len(encoded_body)
+        elif encoded_body is not None:
+            # the reader shares the buffer of the encoded body, nothing is copied
+            body = _BodyReader(encoded_body)
+            content_length = len(encoded_body)
+        else:
+            body = _handle_body(self.body)
+            if isinstance(body, BytesIO):
+                content_length = len(body.getvalue())
+            elif isinstance(body, _IterableBody):
+                _set_streaming_headers(headers)
 
         if (
             self.auto_calculate_content_length
-            and isinstance(body, BytesIO)
+            and content_length is not None
             and "Content-Length" not in headers
         ):
-            content_length = len(body.getvalue())
             headers["Content-Length"] = str(content_length)
 
+        body = self._apply_network_conditions(request, body)
         return _form_response(body, headers, status, request.method)
 
     def __repr__(self) -> str:
@@ -645,7 +981,7 @@ class Response(BaseResponse):
                 url=self.url,
                 status=self.status,
                 content_type=self.content_type,
-                headers=json_module.dumps(self.headers),
+                headers=_json.dumps(self.headers),
             )
         )
 
@@ -670,7 +1006,7 @@ class CallbackResponse(BaseResponse):
                 DeprecationWarning,
             )
         self.stream: Optional[bool] = stream
-        self.content_type: Optional[str] = content_type
+        self.content_type = content_type
 
     def get_response(self, request: "PreparedRequest") -> HTTPResponse:
         headers = self.get_headers()
@@ -698,7 +1034,10 @@ class CallbackResponse(BaseResponse):
 
         body = _handle_body(body)
         headers.extend(r_headers)
+        if isinstance(body, _IterableBody):
+            _set_streaming_headers(headers)
 
+        body = self._apply_network_conditions(request, body)
         return _form_response(body, headers, status, request.method)
 
 
@@ -732,6 +1071,9 @@ class RequestsMock:
         registry: Type[FirstMatchRegistry] = FirstMatchRegistry,
         *,
         real_adapter_send: "_HTTPAdapterSend" = _real_send,
+        order_matchers_by_cost: bool = False,
+        read_filelike_body: bool = True,
+        network_conditions: Optional[NetworkConditions] = None,
     ) -> None:
         self._calls: CallList = CallList()
         self.reset()
@@ -743,6 +1085,14 @@ class RequestsMock:
         self._patcher: Optional["_mock_patcher[Any]"] = None
         self._thread_lock = _ThreadingLock()
         self._real_send = real_adapter_send
+        # file-like request bodies are read into memory, unless disabled for large uploads
+        self.read_filelike_body = read_filelike_body
+        # statistics of matchers, cheap and selective matchers are evaluated first
+        self.matcher_stats: Optional[MatcherStats] = (
+            MatcherStats() if order_matchers_by_cost else None
+        )
+        # network simulated for responses without their own network conditions
+        self.network_conditions = network_conditions
 
     def get_registry(self) -> FirstMatchRegistry:
         """Returns current registry instance with responses.
@@ -776,6 +1126,9 @@ class RequestsMock:
     def reset(self) -> None:
         """Resets registry (including type), calls, passthru_prefixes to default values."""
         self._registry = FirstMatchRegistry()
+        for call in self._calls:
+            if isinstance(call.request.body, SpooledBody):
+                call.request.body.close()
         self._calls.reset()
         self.passthru_prefixes = ()
 
@@ -819,6 +1172,17 @@ class RequestsMock:
         if isinstance(method, BaseResponse):
             return self._registry.add(method)
 
+        response = self._build_response(method, url, body, adding_headers, **kwargs)
+        return self._registry.add(response)
+
+    def _build_response(
+        self,
+        method: "_HTTPMethodOrResponse" = None,
+        url: "Optional[_URLPatternType]" = None,
+        body: "_Body" = "",
+        adding_headers: "_HeaderSet" = None,
+        **kwargs: Any,
+    ) -> BaseResponse:
         if adding_headers is not None:
             kwargs.setdefault("headers", adding_headers)
         if (
@@ -835,8 +1199,37 @@ class RequestsMock:
 
         assert url is not None
         assert isinstance(method, str)
-        response = Response(method=method, url=url, body=body, **kwargs)
-        return self._registry.add(response)
+        return Response(method=method, url=url, body=body, **kwargs)
+
+    def add_many(
+        self, responses: Iterable[Union[BaseResponse, Mapping[str, Any]]]
+    ) -> List[BaseResponse]:
+        """
+        Register multiple responses at once.
+
+        Items are either objects which implement the ``BaseResponse`` interface or
+        mappings of keyword arguments accepted by ``add()``. Registering a large
+        number of responses this way is faster than calling ``add()`` for each of them.
+
+        >>> import responses
+        >>> responses.add_many(
+        >>>     [
+        >>>         {"method": "GET", "url": "http://example.com/1", "json": {"id": 1}},
+        >>>         Response(method="GET", url="http://example.com/2"),
+        >>>     ]
+        >>> )
+        """
+        built = (
+            response
+            if isinstance(response, BaseResponse)
+            else self._build_response(**response)
+            for response in responses
+        )
+        registry_add_many = getattr(self._registry, "add_many", None)
+        if registry_add_many is None:
+            # custom registries that don't inherit from `FirstMatchRegistry`
+            return [self._registry.add(response) for response in built]
+        return registry_add_many(built)
 
     delete = partialmethod(add, DELETE)
     get = partialmethod(add, GET)
@@ -856,6 +1249,7 @@ class RequestsMock:
     def _add_from_file(self, file_path: "Union[str, bytes, os.PathLike[Any]]") -> None:
         data = self._parse_response_file(file_path)
 
+        responses = []
         for rsp in data["responses"]:
             rsp = rsp["response"]
             headers = rsp["headers"] if "headers" in rsp else None
@@ -867,16 +1261,27 @@ class RequestsMock:
                 if not headers:
                     headers = None
 
-            self.add(
-                method=rsp["method"],
-                url=rsp["url"],
-                body=rsp["body"],
-                status=rsp["status"],
-                headers=headers,
-                content_type=rsp["content_type"],
-                auto_calculate_content_length=rsp["auto_calculate_content_length"],
+            responses.append(
+                {
+                    "method": rsp["method"],
+                    "url": rsp["url"],
+                    "body": rsp["body"],
+                    "status": rsp["status"],
+                    "headers": headers,
+                    "content_type": rsp["content_type"],
+                    "auto_calculate_content_length": rsp[
+                        "auto_calculate_content_length"
+                    ],
+                }
             )
 
+        if type(self).add is not RequestsMock.add:
+            # a subclass customizes registration, don't bypass it
+            for kwargs in responses:
+                self.add(**kwargs)
+            return
+        self.add_many(responses)
+
     def add_passthru(self, prefix: "_URLPatternType") -> None:
         """
         Register a URL prefix or regex to passthru any non-matching mock requests to.
@@ -978,6 +1383,7 @@ class RequestsMock:
         match_querystring: Union[bool, FalseBool] = FalseBool(),
         content_type: Optional[str] = "text/plain",
         match: "_MatcherIterable" = (),
+        network_conditions: Optional[NetworkConditions] = None,
     ) -> BaseResponse:
         return self._registry.add(
             CallbackResponse(
@@ -987,6 +1393,7 @@ class RequestsMock:
                 content_type=content_type,
                 match_querystring=match_querystring,
                 match=match,
+                network_conditions=network_conditions,
             )
         )
 
@@ -1044,7 +1451,7 @@ class RequestsMock:
 
     def _find_match(
         self, request: "PreparedRequest"
-    ) -> Tuple[Optional["BaseResponse"], List[str]]:
+    ) -> Tuple[Optional["BaseResponse"], List["_Reason"]]:
         """
         Iterates through all available matches and validates if any of them matches the request
 
@@ -1053,8 +1460,13 @@ class RequestsMock:
             (Response) found match. If multiple found, then remove & return the first match.
             (list) list with reasons why other matches don't match
         """
+        registry = self._registry
+        if type(registry).find is FirstMatchRegistry.find:
+            # default lookup is thread-safe and only locks to modify the registry
+            return registry.find(request)
+
         with self._thread_lock:
-            return self._registry.find(request)
+            return registry.find(request)
 
     def _parse_request_params(
         self, url: str
@@ -1098,8 +1510,14 @@ class RequestsMock:
         # original request object does not have these attributes
         request.params = self._parse_request_params(request.path_url)  # type: ignore[attr-defined]
         request.req_kwargs = kwargs  # type: ignore[attr-defined]
-        request_url = str(request.url)
-        request.body = self._read_filelike_body(request.body)
+        if self.matcher_stats is not None:
+            request.matcher_stats = self.matcher_stats  # type: ignore[attr-defined]
+        if self.network_conditions is not None:
+            request.network_conditions = self.network_conditions  # type: ignore[attr-defined]
+        request_url = get_parsed_url(request)
+        if self.read_filelike_body:
+            request.body = self._read_filelike_body(request.body)
+        get_parsed_body(request)
 
         match, match_failed_reasons = self._find_match(request)
         resp_callback = self.response_callback
@@ -1271,10 +1689,15 @@ __all__ = [
     "CallbackResponse",
     "Response",
     "RequestsMock",
+    "JSONBackend",
+    "get_json_backend",
+    "set_json_backend",
+    "NetworkConditions",
     # Exposed by the RequestsMock class:
     "activate",
     "add",
     "_add_from_file",
+    "add_many",
     "add_callback",
     "add_passthru",
     "_deprecated_assert_all_requests_are_fired",
@@ -1310,6 +1733,7 @@ __all__ = [
 activate = _default_mock.activate
 add = _default_mock.add
 _add_from_file = _default_mock._add_from_file
+add_many = _default_mock.add_many
 add_callback = _default_mock.add_callback
 add_passthru = _default_mock.add_passthru
 _deprecated_assert_all_requests_are_fired = _default_mock.assert_all_requests_are_fired
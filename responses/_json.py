@@ -0,0 +1,119 @@
+"""JSON backend used to encode and decode JSON bodies.
+
+``responses`` encodes ``json=`` bodies of responses and decodes JSON request bodies
+for matchers through the backend set by ``set_json_backend``. By default an
+installed ``orjson`` is used to decode, encoding stays with the standard library,
+because the encoded body is visible to the tested code.
+"""
+import json as json_module
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Union
+
+
+class JSONBackend:
+    """Functions used to encode and decode JSON.
+
+    Parameters
+    ----------
+    name : str
+        Name of the backend, displayed in ``repr``.
+    dumps : Callable[[Any], str]
+        Serializes an object to a JSON string.
+    loads : Callable[[Union[str, bytes]], Any]
+        Deserializes a JSON document. Must raise ``json.JSONDecodeError``, or its
+        subclass, for invalid documents.
+
+    """
+
+    __slots__ = ("name", "dumps", "loads")
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], str],
+        loads: Callable[[Union[str, bytes]], Any],
+    ) -> None:
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"JSONBackend(name={self.name!r})"
+
+
+STDLIB_BACKEND = JSONBackend("json", json_module.dumps, json_module.loads)
+
+
+def _orjson_backend(encode: bool) -> JSONBackend:
+    import orjson
+
+    def loads(document: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(document)
+        except orjson.JSONDecodeError:
+            # the standard library accepts documents that orjson rejects,
+            # e.g. NaN or integers over 64 bits
+            return json_module.loads(document)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    if encode:
+        return JSONBackend("orjson", dumps, loads)
+    return JSONBackend("orjson (decode only)", json_module.dumps, loads)
+
+
+def _detect_backend() -> JSONBackend:
+    try:
+        return _orjson_backend(encode=False)
+    except ImportError:
+        return STDLIB_BACKEND
+
+
+_backend = _detect_backend()
+
+
+def get_json_backend() -> JSONBackend:
+    """Get the backend used to encode and decode JSON."""
+    return _backend
+
+
+def set_json_backend(backend: Optional[Union[str, JSONBackend]] = None) -> JSONBackend:
+    """Set the backend used to encode and decode JSON.
+
+    Parameters
+    ----------
+    backend : str or JSONBackend, optional
+        ``"json"`` for the standard library, ``"orjson"`` to encode and decode with
+        ``orjson``, a custom ``JSONBackend``, or ``None`` to detect the backend
+        again. Note, ``orjson`` encodes without whitespace between items.
+
+    Returns
+    -------
+    JSONBackend
+        The backend that was set.
+
+    """
+    global _backend
+
+    if backend is None:
+        _backend = _detect_backend()
+    elif isinstance(backend, JSONBackend):
+        _backend = backend
+    elif backend == "json":
+        _backend = STDLIB_BACKEND
+    elif backend == "orjson":
+        _backend = _orjson_backend(encode=True)
+    else:
+        raise ValueError(f"Unknown JSON backend {backend!r}")
+    return _backend
+
+
+def dumps(obj: Any) -> str:
+    return _backend.dumps(obj)
+
+
+def loads(document: Union[str, bytes]) -> Any:
+    return _backend.loads(document)
@@ -0,0 +1,144 @@
+"""Simulated network conditions of mocked responses.
+
+``NetworkConditions`` delay a mocked response before its first byte and cap the
+throughput of its body, so that timeouts, parallel fetchers and progress reporting
+can be tested against a slow network. The ``timeout`` of the request is respected.
+"""
+import time
+from io import RawIOBase
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from requests.exceptions import ConnectTimeout
+from requests.exceptions import ReadTimeout
+
+if TYPE_CHECKING:  # pragma: no cover
+    # import only for linter run
+    from requests import PreparedRequest
+
+
+class NetworkConditions(NamedTuple):
+    """Network conditions simulated for a mocked response.
+
+    Parameters
+    ----------
+    connect_latency : float
+        Seconds to establish the connection. Raises ``requests.ConnectTimeout``
+        when it exceeds the connect timeout of the request.
+    latency : float
+        Seconds from sending the request to the first byte of the response. Raises
+        ``requests.ReadTimeout`` when it exceeds the read timeout of the request.
+    jitter : Callable[[], float], optional
+        Returns seconds added to ``latency`` on every call, e.g.
+        ``functools.partial(random.uniform, 0, 0.1)``.
+    bandwidth : float, optional
+        Maximum number of bytes per second at which the body is read.
+
+    """
+
+    connect_latency: float = 0.0
+    latency: float = 0.0
+    jitter: Optional[Callable[[], float]] = None
+    bandwidth: Optional[float] = None
+
+    def wait(self, request: "PreparedRequest") -> None:
+        """Wait for the connection and the first byte of the response.
+
+        Parameters
+        ----------
+        request : PreparedRequest
+            Sent request, the ``timeout`` is taken from its ``req_kwargs``.
+
+        """
+        connect_timeout, read_timeout = _split_timeout(
+            vars(request).get("req_kwargs", {}).get("timeout")
+        )
+
+        if connect_timeout is not None and self.connect_latency > connect_timeout:
+            time.sleep(connect_timeout)
+            raise ConnectTimeout(
+                f"Connection to {request.url} timed out. "
+                f"(connect timeout={connect_timeout})",
+                request=request,
+            )
+        time.sleep(self.connect_latency)
+
+        latency = self.latency
+        if self.jitter is not None:
+            latency = max(latency + self.jitter(), 0.0)
+        if read_timeout is not None and latency > read_timeout:
+            time.sleep(read_timeout)
+            raise ReadTimeout(
+                f"Read timed out. (read timeout={read_timeout})", request=request
+            )
+        time.sleep(latency)
+
+
+def _as_seconds(value: Any) -> Optional[float]:
+    # urllib3 ``Timeout`` uses a sentinel for the default timeout
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def _split_timeout(timeout: Any) -> Tuple[Optional[float], Optional[float]]:
+    """Split the ``timeout`` accepted by ``requests`` into connect and read timeout."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return _as_seconds(connect), _as_seconds(read)
+    if hasattr(timeout, "connect_timeout"):
+        return _as_seconds(timeout.connect_timeout), _as_seconds(timeout.read_timeout)
+    return _as_seconds(timeout), _as_seconds(timeout)
+
+
+class ThrottledBody(RawIOBase):
+    """Body of a mocked response read at most at ``bandwidth`` bytes per second.
+
+    Parameters
+    ----------
+    body : file-like object
+        Body of the response, see ``responses._handle_body``.
+    bandwidth : float
+        Maximum number of bytes per second.
+
+    """
+
+    def __init__(self, body: Any, bandwidth: float) -> None:
+        self._body = body
+        self._bandwidth = bandwidth
+        self._started: Optional[float] = None
+        self._sent = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def isclosed(self) -> bool:
+        """Report the wrapped body as closed, see ``responses._BodyReader.isclosed``."""
+        if self.closed:
+            return True
+        isclosed = getattr(self._body, "isclosed", None)
+        return bool(isclosed() if isclosed is not None else self._body.closed)
+
+    def readinto(self, buffer: Any) -> int:
+        if self._body.closed:
+            return 0
+        data = self._body.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+
+        # sleep until the bytes sent so far are due, sleeps don't accumulate errors
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        self._sent += size
+        delay = self._started + self._sent / self._bandwidth - now
+        if delay > 0:
+            time.sleep(delay)
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._body.close()
+        super().close()
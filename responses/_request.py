@@ -0,0 +1,470 @@
+"""Parts of the intercepted request that are computed once and shared by matchers."""
+import gzip
+import hashlib
+import re
+from collections import Counter
+from tempfile import SpooledTemporaryFile
+from typing import IO
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+from urllib.parse import urlunparse
+
+from urllib3.util.url import parse_url
+
+from responses import _json
+
+
+def _get_url_and_path(url: str) -> str:
+    """Construct URL only containing scheme, netloc and path by truncating other parts.
+
+    This method complies with RFC 3986.
+
+    Examples
+    --------
+    >>> _get_url_and_path("http://example.com/path;segment?ab=xy&zed=qwe#test=1&foo=bar")
+    "http://example.com/path;segment"
+
+
+    Parameters
+    ----------
+    url : str
+        URL to parse.
+
+    Returns
+    -------
+    url : str
+        URL with scheme, netloc and path
+
+    """
+    url_parsed = urlsplit(url)
+    url_and_path = urlunparse(
+        [url_parsed.scheme, url_parsed.netloc, url_parsed.path, None, None, None]
+    )
+    return parse_url(url_and_path).url
+
+
+_MISSING = object()
+
+# bodies held in memory, bytes-like objects are converted to ``bytes`` to be parsed
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+# file-like and iterable bodies are hashed in chunks of this size
+_CHUNK_SIZE = 64 * 1024
+# iterable bodies are copied to memory up to this size, to a temporary file otherwise
+_SPOOL_MAX_SIZE = 1024 * 1024
+
+_QueryMultiset = FrozenSet[Tuple[Tuple[str, str], int]]
+
+
+def canonical_query(query: Optional[str]) -> Optional[_QueryMultiset]:
+    """Build a hashable canonical form of the query string.
+
+    Query strings with the same parameters in any order have equal canonical
+    forms, repeated parameters are counted. Returns ``None`` for an empty or
+    missing query string.
+    """
+    if not query:
+        return None
+    return frozenset(Counter(parse_qsl(query)).items())
+
+
+def canonical_params(params: Mapping[Any, Any]) -> FrozenSet[Tuple[Any, Any]]:
+    """Build a hashable canonical form of the parsed query parameters.
+
+    Equal mappings have equal canonical forms. Raises ``TypeError`` for
+    values that can't be hashed.
+    """
+    return frozenset(
+        (key, (list, tuple(value)) if isinstance(value, list) else value)
+        for key, value in params.items()
+    )
+
+
+def get_canonical_params(request: Any) -> FrozenSet[Tuple[Any, Any]]:
+    """Get the canonical form of ``request.params``, compute it on first use."""
+    params = request.params or {}
+    cached = vars(request).get("_canonical_params")
+    if cached is None or cached[0] is not params:
+        cached = (params, canonical_params(params))
+        request._canonical_params = cached
+    return cached[1]
+
+
+class ParsedURL(str):
+    """URL of the intercepted request with its components parsed once.
+
+    Behaves as the plain URL string, the parsed components are available as
+    attributes. ``responses`` attaches it to the request as ``parsed_url``, so
+    URL comparison and matchers don't parse the URL again for every registered
+    response.
+    """
+
+    url_and_path: str
+    query: Optional[str]
+    fragment: str
+    host: Optional[str]
+    _canonical_query: Any
+
+    def __new__(cls, url: str) -> "ParsedURL":
+        self = super().__new__(cls, url)
+        self.url_and_path = _get_url_and_path(url)
+        parsed = parse_url(url)
+        self.query = parsed.query
+        self.host = parsed.host
+        self.fragment = urlsplit(url).fragment
+        self._canonical_query = _MISSING
+        return self
+
+    @property
+    def canonical_query(self) -> Optional[_QueryMultiset]:
+        """Canonical form of the query string, see ``canonical_query``."""
+        if self._canonical_query is _MISSING:
+            self._canonical_query = canonical_query(self.query)
+        return self._canonical_query
+
+
+def get_parsed_url(request: Any) -> ParsedURL:
+    """Get the parsed URL of the request, parse it on first use.
+
+    Parameters
+    ----------
+    request : PreparedRequest
+        Request that was caught by the custom adapter.
+
+    Returns
+    -------
+    ParsedURL
+        Parsed URL of the request.
+
+    """
+    url = str(request.url or "")
+    parsed_url = vars(request).get("parsed_url")
+    if not isinstance(parsed_url, ParsedURL) or parsed_url != url:
+        parsed_url = ParsedURL(url)
+        request.parsed_url = parsed_url
+    return parsed_url
+
+
+class UnreadableBodyError(TypeError):
+    """Request body is a stream that can't be read without consuming it."""
+
+
+class ParsedBody:
+    """Body of the intercepted request, decoded and parsed on first use.
+
+    ``responses`` attaches it to the request as ``parsed_body``. Matchers of all
+    registered responses share it, thus a large body is decoded, decompressed and
+    parsed at most once per request, no matter how many responses are checked.
+    Errors are cached as well and raised again on every access.
+
+    The parsed values are shared between matchers and must not be modified.
+    """
+
+    def __init__(self, body: Any) -> None:
+        self.raw = body
+        self._cache: Dict[Any, Any] = {}
+
+    def _cached(self, key: Any, compute: Callable[[], Any]) -> Any:
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            try:
+                value = compute()
+            except Exception as exc:
+                value = _Failure(exc)
+            self._cache[key] = value
+
+        if isinstance(value, _Failure):
+            raise value.exc.with_traceback(None)
+        return value
+
+    @property
+    def content(self) -> Any:
+        """Body as ``bytes`` or ``str``, a rewindable stream is read in full.
+
+        The position of the stream is restored. Raises ``UnreadableBodyError`` for
+        streams that can't be rewound and for iterable bodies, e.g. generators.
+        """
+
+        def read() -> Any:
+            body = self.raw
+            if body is None or isinstance(body, (str, bytes)):
+                return body
+            if isinstance(body, (bytearray, memoryview)):
+                return bytes(body)
+            if not _is_rewindable(body):
+                if hasattr(body, "read") or hasattr(body, "__iter__"):
+                    raise UnreadableBodyError(
+                        f"request.body of type {type(body).__name__} can't be read "
+                        "without consuming it"
+                    )
+                return body
+
+            position = body.tell()
+            try:
+                return body.read()
+            finally:
+                body.seek(position)
+
+        return self._cached("content", read)
+
+    @property
+    def text(self) -> str:
+        """Body decoded as UTF-8, or converted to a string if it isn't bytes."""
+
+        def decode() -> str:
+            content = self.content
+            if isinstance(content, bytes):
+                return content.decode("utf-8")
+            return str(content)
+
+        return self._cached("text", decode)
+
+    @property
+    def decompressed(self) -> bytes:
+        """Body bytes decompressed with gzip."""
+        return self._cached("decompressed", lambda: gzip.decompress(self.content))
+
+    @property
+    def json(self) -> Any:
+        """Body parsed as JSON, an empty body is parsed as an empty dict.
+
+        Bytes that aren't valid UTF-8 are considered gzip compressed.
+        """
+
+        def load() -> Any:
+            body = self.content
+            if isinstance(body, bytes):
+                try:
+                    body = self.text
+                except UnicodeDecodeError:
+                    body = self.decompressed.decode("utf-8")
+            return _json.loads(body) if body else {}
+
+        return self._cached("json", load)
+
+    def digest(self, algorithm: str) -> Tuple[str, int]:
+        """Hex digest and length in bytes of the body, see ``hashlib.new``.
+
+        File-like bodies are read in chunks and their position is restored. Strings
+        are encoded as UTF-8.
+        """
+        return self._cached(("digest", algorithm), lambda: _digest(self.raw, algorithm))
+
+    def multipart(self, boundary: str) -> Optional[Tuple["MultipartPart", ...]]:
+        """Parts of the ``multipart/form-data`` body delimited by the boundary.
+
+        Returns ``None`` if the body isn't valid multipart data.
+        """
+        return self._cached(
+            ("multipart", boundary), lambda: parse_multipart(self.content, boundary)
+        )
+
+    def form_pairs(self, keep_blank_values: bool = False) -> List[Tuple[Any, Any]]:
+        """Body parsed as URL encoded form data, see ``urllib.parse.parse_qsl``."""
+        return self._cached(
+            ("form_pairs", keep_blank_values),
+            lambda: parse_qsl(self.content, keep_blank_values=keep_blank_values),
+        )
+
+
+class MultipartPart(NamedTuple):
+    """Part of a ``multipart/form-data`` body, see ``parse_multipart``."""
+
+    name: Optional[str]
+    filename: Optional[str]
+    # header names are lowercase, in the order of the body
+    headers: Tuple[Tuple[str, str], ...]
+    digest: str
+    length: int
+    # beginning of the content, used in mismatch reasons
+    preview: bytes
+
+    def __str__(self) -> str:
+        if self.filename is None:
+            return repr(self.name)
+        return f"{self.name!r} (filename {self.filename!r})"
+
+
+_MULTIPART_PREVIEW_SIZE = 100
+_DISPOSITION_PARAM = re.compile(r';\s*(name|filename)="([^"]*)"')
+
+
+def parse_multipart(body: Any, boundary: str) -> Optional[Tuple[MultipartPart, ...]]:
+    """Parse a ``multipart/form-data`` body into its parts.
+
+    Content of the parts is kept only as digest, length and a short preview.
+
+    Parameters
+    ----------
+    body : bytes or str
+        Request body.
+    boundary : str
+        Boundary from the ``Content-Type`` header.
+
+    Returns
+    -------
+    Tuple[MultipartPart, ...], optional
+        Parts in the order of the body, ``None`` if the body isn't valid
+        multipart data.
+
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not boundary or not isinstance(body, bytes):
+        return None
+
+    sections = body.split(b"--" + boundary.encode("utf-8"))
+    # the body starts with the first delimiter and ends with the closing delimiter
+    if len(sections) < 2 or sections[0] or not sections[-1].startswith(b"--"):
+        return None
+
+    parts = []
+    for section in sections[1:-1]:
+        if not section.startswith(b"\r\n") or not section.endswith(b"\r\n"):
+            return None
+        section = section[2:-2]
+        if section.startswith(b"\r\n"):
+            head, content = b"", section[2:]
+        else:
+            head, separator, content = section.partition(b"\r\n\r\n")
+            if not separator:
+                return None
+
+        headers = []
+        for line in head.decode("utf-8", "replace").split("\r\n") if head else ():
+            name, colon, value = line.partition(":")
+            if not colon:
+                return None
+            headers.append((name.strip().lower(), value.strip()))
+
+        disposition = dict(headers).get("content-disposition", "")
+        params = dict(_DISPOSITION_PARAM.findall(disposition))
+        parts.append(
+            MultipartPart(
+                name=params.get("name"),
+                filename=params.get("filename"),
+                headers=tuple(headers),
+                digest=hashlib.sha256(content).hexdigest(),
+                length=len(content),
+                preview=content[:_MULTIPART_PREVIEW_SIZE],
+            )
+        )
+    return tuple(parts)
+
+
+class _Failure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: Exception) -> None:
+        self.exc = exc
+
+
+def get_parsed_body(request: Any) -> ParsedBody:
+    """Get the parsed body of the request, the body is parsed lazily.
+
+    Parameters
+    ----------
+    request : PreparedRequest
+        Request that was caught by the custom adapter.
+
+    Returns
+    -------
+    ParsedBody
+        Parsed body of the request, shared by all matchers.
+
+    """
+    parsed_body = vars(request).get("parsed_body")
+    if not isinstance(parsed_body, ParsedBody) or parsed_body.raw is not request.body:
+        parsed_body = ParsedBody(request.body)
+        request.parsed_body = parsed_body
+    return parsed_body
+
+
+def _digest(body: Any, algorithm: str) -> Tuple[str, int]:
+    hasher = hashlib.new(algorithm)
+    if body is None:
+        body = b""
+    elif isinstance(body, str):
+        body = body.encode("utf-8")
+
+    if isinstance(body, _BUFFER_TYPES):
+        hasher.update(body)
+        return hasher.hexdigest(), memoryview(body).nbytes
+
+    position = body.tell()
+    length = 0
+    try:
+        for chunk in _iter_chunks(body):
+            hasher.update(chunk)
+            length += len(chunk)
+    finally:
+        body.seek(position)
+    return hasher.hexdigest(), length
+
+
+def _iter_chunks(body: Any) -> Iterator[bytes]:
+    """Iterate over a stream or an iterable body in bytes chunks."""
+    if hasattr(body, "read"):
+        chunks = iter(lambda: body.read(_CHUNK_SIZE) or b"", b"")
+    else:
+        chunks = iter(body)
+    for chunk in chunks:
+        yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def _is_rewindable(body: Any) -> bool:
+    if body is None or isinstance(body, (str, *_BUFFER_TYPES)):
+        return True
+    seekable = getattr(body, "seekable", None)
+    return callable(seekable) and bool(seekable()) and hasattr(body, "read")
+
+
+class SpooledBody(SpooledTemporaryFile):  # type: ignore[type-arg]
+    """Copy of a request body that could be read only once.
+
+    ``RequestsMock`` closes it when the calls are reset.
+    """
+
+
+def _spool(body: Any) -> "IO[bytes]":
+    """Copy a stream or an iterable body in chunks to a rewindable file."""
+    spooled: IO[bytes] = SpooledBody(max_size=_SPOOL_MAX_SIZE)
+    for chunk in _iter_chunks(body):
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def get_body_digest(request: Any, algorithm: str) -> Tuple[str, int]:
+    """Get the digest and the length of the request body, see ``ParsedBody.digest``.
+
+    Streams that can't be rewound and iterable bodies, e.g. generators, are consumed
+    once and replaced by a temporary file with the same content. The body is never
+    held in memory as a whole, unless it is small.
+
+    Parameters
+    ----------
+    request : PreparedRequest
+        Request that was caught by the custom adapter.
+    algorithm : str
+        Name of the hash algorithm, e.g. ``"sha256"``.
+
+    Returns
+    -------
+    Tuple[str, int]
+        Hex digest and length in bytes of the body.
+
+    """
+    if not _is_rewindable(request.body):
+        request.body = _spool(request.body)
+    return get_parsed_body(request).digest(algorithm)
@@ -1,9 +1,13 @@
-import gzip
-import json as json_module
+import hashlib
 import re
+import time
 from json.decoder import JSONDecodeError
+from threading import Lock
 from typing import Any
 from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import List
 from typing import Mapping
 from typing import MutableMapping
@@ -12,10 +16,324 @@ from typing import Pattern
 from typing import Tuple
 from typing import Union
 from urllib.parse import parse_qsl
-from urllib.parse import urlparse
 
 from requests import PreparedRequest
-from urllib3.util.url import parse_url
+from requests.structures import CaseInsensitiveDict
+
+from responses._request import UnreadableBodyError
+from responses._request import canonical_params
+from responses._request import canonical_query
+from responses._request import get_body_digest
+from responses._request import get_canonical_params
+from responses._request import get_parsed_body
+from responses._request import get_parsed_url
+from responses._request import parse_multipart
+
+
+class LazyReason:
+    """Reason of a match failure that is formatted only when it is displayed.
+
+    Most of the failed comparisons are never reported, because the request is
+    matched by another response. Formatting request data for them is a waste,
+    thus matchers return the template and its arguments instead of a string.
+    Custom matchers can return ``LazyReason`` as well.
+
+    >>> reason = LazyReason("{} doesn't match {}", {"a": 1}, {"a": 2})
+    >>> str(reason)
+    "{'a': 1} doesn't match {'a': 2}"
+
+    """
+
+    __slots__ = ("_template", "_args", "_rendered")
+
+    def __init__(self, template: str, *args: Any) -> None:
+        self._template = template
+        self._args = args
+        self._rendered: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._rendered is None:
+            self._rendered = self._template.format(*self._args)
+        return self._rendered
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (str, LazyReason)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __add__(self, other: str) -> "LazyReason":
+        return LazyReason("{}{}", self, other)
+
+    def __radd__(self, other: str) -> "LazyReason":
+        return LazyReason("{}{}", other, self)
+
+
+_Reason = Union[str, LazyReason]
+
+
+class _Deferred:
+    """Argument of ``LazyReason`` that is computed when the reason is formatted.
+
+    >>> str(LazyReason("{}", _Deferred(sorted, "cba")))
+    "['a', 'b', 'c']"
+
+    """
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any) -> None:
+        self._func = func
+        self._args = args
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self._func(*self._args), format_spec)
+
+
+def _sorted_query(query: Optional[str]) -> Dict[str, str]:
+    return dict(sorted(parse_qsl(query or "")))
+
+
+def _join_parts(parts: Iterable[Any]) -> str:
+    return ", ".join(map(str, parts))
+
+
+def _filter_params(
+    params: Mapping[str, Any], expected: Mapping[str, Any]
+) -> Dict[str, Any]:
+    return {k: v for k, v in params.items() if k in expected}
+
+
+def _filter_headers(
+    headers: Mapping[str, str], names: FrozenSet[str]
+) -> Dict[str, str]:
+    return {k: v for k, v in headers.items() if k.lower() in names}
+
+
+class MatcherConstraints:
+    """Requirements of a matcher that can be checked without calling it.
+
+    A request that doesn't satisfy the constraints is never matched by the matcher,
+    thus registries skip responses with such matchers without evaluating them.
+    Built-in matchers expose their constraints as ``constraints`` attribute, custom
+    matchers can set the attribute as well.
+
+    >>> matcher = header_matcher({"Accept": "application/json"})
+    >>> matcher.constraints
+    MatcherConstraints(headers=['accept'], query=[], json_keys=[])
+
+    Parameters
+    ----------
+    headers : Iterable[str]
+        Names of headers that must be present in the request, case-insensitive.
+    query : Iterable[str]
+        Names of query parameters that must be present in the request.
+    json_keys : Iterable[str]
+        Top-level keys that must be present in the JSON object of the request body.
+
+    """
+
+    __slots__ = ("headers", "query", "json_keys")
+
+    def __init__(
+        self,
+        headers: Iterable[str] = (),
+        query: Iterable[str] = (),
+        json_keys: Iterable[str] = (),
+    ) -> None:
+        self.headers: FrozenSet[str] = frozenset(name.lower() for name in headers)
+        self.query: FrozenSet[str] = frozenset(query)
+        self.json_keys: FrozenSet[str] = frozenset(json_keys)
+
+    def __repr__(self) -> str:
+        return "MatcherConstraints(headers={}, query={}, json_keys={})".format(
+            sorted(self.headers), sorted(self.query), sorted(self.json_keys)
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MatcherConstraints):
+            return NotImplemented
+        return (
+            self.headers == other.headers
+            and self.query == other.query
+            and self.json_keys == other.json_keys
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.headers, self.query, self.json_keys))
+
+    def __bool__(self) -> bool:
+        return bool(self.headers or self.query or self.json_keys)
+
+    def __or__(self, other: "MatcherConstraints") -> "MatcherConstraints":
+        return MatcherConstraints(
+            self.headers | other.headers,
+            self.query | other.query,
+            self.json_keys | other.json_keys,
+        )
+
+    def satisfied_by(self, request: PreparedRequest) -> bool:
+        """Check that the request might be matched.
+
+        Returns ``True`` if a part of the request that is needed for the check is
+        not available, e.g. the body is not valid JSON. The matcher reports the
+        failure in this case.
+        """
+        if self.headers:
+            headers = request.headers
+            if not isinstance(headers, CaseInsensitiveDict):
+                headers = CaseInsensitiveDict(headers or {})
+            if not all(name in headers for name in self.headers):
+                return False
+
+        if self.query:
+            params = getattr(request, "params", None)
+            if params is not None and not self.query.issubset(params):
+                return False
+
+        if self.json_keys:
+            try:
+                json_body = get_parsed_body(request).json
+            except Exception:
+                return True
+            if not isinstance(json_body, dict) or not self.json_keys.issubset(
+                json_body
+            ):
+                return False
+
+        return True
+
+
+def get_constraints(matchers: Iterable[Callable[..., Any]]) -> MatcherConstraints:
+    """Combine the constraints of the matchers, see ``MatcherConstraints``.
+
+    Parameters
+    ----------
+    matchers : Iterable[Callable]
+        Matchers of a response.
+
+    Returns
+    -------
+    MatcherConstraints
+        Requirements of all matchers, empty if none of the matchers provides them.
+
+    """
+    combined = MatcherConstraints()
+    for matcher in matchers:
+        constraints = getattr(matcher, "constraints", None)
+        if isinstance(constraints, MatcherConstraints):
+            combined = combined | constraints
+    return combined
+
+
+class MatcherStat:
+    """Call statistics of a single matcher, see ``MatcherStats``."""
+
+    __slots__ = ("name", "calls", "failures", "total_time")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.failures = 0
+        self.total_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"MatcherStat(name={self.name!r}, calls={self.calls}, "
+            f"failures={self.failures}, total_time={self.total_time:.6f})"
+        )
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.calls if self.calls else 0.0
+
+    @property
+    def rank(self) -> float:
+        """Expected time spent per rejected request, matchers with a low rank run first.
+
+        Matchers that were not called yet have rank ``0`` and keep their position.
+        """
+        if not self.calls:
+            return 0.0
+        if not self.failures:
+            return float("inf")
+        return self.mean_time / self.failure_rate
+
+
+class MatcherStats:
+    """Call counts and cumulative time of matchers.
+
+    When enabled on ``RequestsMock``, matchers of a response are evaluated in the
+    order of their ``MatcherStat.rank``, so cheap matchers that reject most of the
+    requests run before expensive ones. Each matcher returns the same result in
+    any order, only the reason reported for a failed match might differ.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[int, Tuple[Callable[..., Any], MatcherStat]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def get(self, matcher: Callable[..., Any]) -> Optional[MatcherStat]:
+        """Get the statistics of the matcher, ``None`` if it was never called."""
+        entry = self._stats.get(id(matcher))
+        return entry[1] if entry is not None else None
+
+    def items(self) -> List[Tuple[Callable[..., Any], MatcherStat]]:
+        """Matchers with their statistics, most time-consuming first."""
+        return sorted(
+            self._stats.values(), key=lambda entry: entry[1].total_time, reverse=True
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def record(self, matcher: Callable[..., Any], valid: bool, elapsed: float) -> None:
+        with self._lock:
+            entry = self._stats.get(id(matcher))
+            if entry is None:
+                name = getattr(matcher, "__qualname__", None) or repr(matcher)
+                # the matcher is kept referenced, so its id can't be reused
+                entry = self._stats[id(matcher)] = (matcher, MatcherStat(name))
+            stat = entry[1]
+            stat.calls += 1
+            stat.failures += not valid
+            stat.total_time += elapsed
+
+    def order(self, matchers: Iterable[Callable[..., Any]]) -> List[Callable[..., Any]]:
+        """Sort matchers by their rank, the sort is stable."""
+        stats = self._stats
+
+        def rank(matcher: Callable[..., Any]) -> float:
+            entry = stats.get(id(matcher))
+            return entry[1].rank if entry is not None else 0.0
+
+        return sorted(matchers, key=rank)
+
+    def evaluate(
+        self, matchers: Iterable[Callable[..., Any]], request: PreparedRequest
+    ) -> Tuple[bool, _Reason]:
+        """Call the matchers in the order of their rank and record the statistics."""
+        for matcher in self.order(matchers):
+            start = time.perf_counter()
+            valid, reason = matcher(request)
+            self.record(matcher, valid, time.perf_counter() - start)
+            if not valid:
+                return False, reason
+
+        return True, ""
 
 
 def _filter_dict_recursively(
@@ -39,20 +357,74 @@ def _filter_dict_recursively(
 
 
 def body_matcher(params: str, *, allow_blank: bool = False) -> Callable[..., Any]:
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        reason = ""
-        if isinstance(request.body, bytes):
-            request_body = request.body.decode("utf-8")
-        else:
-            request_body = str(request.body)
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        reason: _Reason = ""
+        try:
+            request_body = get_parsed_body(request).text
+        except UnreadableBodyError as exc:
+            return False, f"request.body doesn't match: {exc}"
         valid = True if request_body == params else False
         if not valid:
-            reason = f"request.body doesn't match {params} doesn't match {request_body}"
+            reason = LazyReason(
+                "request.body doesn't match {} doesn't match {}", params, request_body
+            )
         return valid, reason
 
     return match
 
 
+def body_digest_matcher(
+    digest: str, *, algorithm: str = "sha256", length: Optional[int] = None
+) -> Callable[..., Any]:
+    """Matches the digest of the request body, e.g. of a large upload.
+
+    File-like and iterable request bodies are hashed in chunks, so the expected
+    payload doesn't have to be kept in the test and the request body doesn't have
+    to be read into memory. Streams that can't be rewound and iterable bodies are
+    replaced with a temporary file of the same content. Use
+    ``RequestsMock(read_filelike_body=False)`` to keep file-like bodies unread
+    until they are matched.
+
+    Parameters
+    ----------
+    digest : str
+        Expected hex digest of the request body.
+    algorithm : str, default="sha256"
+        Name of the hash algorithm, any algorithm supported by ``hashlib.new``,
+        e.g. ``"blake2b"``.
+    length : int, optional
+        Expected length of the request body in bytes.
+
+    Returns
+    -------
+    Callable
+        Matcher function.
+
+    """
+    # fail early for unsupported algorithms
+    hashlib.new(algorithm)
+    expected_digest = digest.lower()
+
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        request_digest, request_length = get_body_digest(request, algorithm)
+        valid = request_digest == expected_digest and (
+            length is None or request_length == length
+        )
+        if not valid:
+            return False, LazyReason(
+                "request.body digest doesn't match: {} {} ({} bytes) "
+                "doesn't match {} ({} bytes)",
+                algorithm,
+                request_digest,
+                request_length,
+                expected_digest,
+                "any" if length is None else length,
+            )
+        return True, ""
+
+    return match
+
+
 def urlencoded_params_matcher(
     params: Optional[Mapping[str, str]],
     *,
@@ -69,14 +441,17 @@ def urlencoded_params_matcher(
     :return: (func) matcher
     """
 
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        reason = ""
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        reason: _Reason = ""
         request_body = request.body
-        qsl_body: Mapping[Any, Any] = (
-            dict(parse_qsl(request_body, keep_blank_values=allow_blank))  # type: ignore[type-var]
-            if request_body
-            else {}
-        )
+        try:
+            qsl_body: Mapping[Any, Any] = (
+                dict(get_parsed_body(request).form_pairs(keep_blank_values=allow_blank))
+                if request_body
+                else {}
+            )
+        except UnreadableBodyError as exc:
+            return False, f"request.body doesn't match: {exc}"
         request_params = qsl_body
         match_params = params or {}
 
@@ -93,14 +468,13 @@ def urlencoded_params_matcher(
             valid = False
 
         if not valid:
-            reason = (
-                f"request.body doesn't match: {qsl_body} doesn't match {match_params}"
-            )
+            template = "request.body doesn't match: {} doesn't match {}"
             if strict_match:
-                reason += (
+                template += (
                     "\nNote: You're using strict parameter check. "
                     "To try a partial match, use strict_match=False"
                 )
+            reason = LazyReason(template, qsl_body, match_params)
 
         return valid, reason
 
@@ -130,17 +504,12 @@ def json_params_matcher(
 
     """
 
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        reason = ""
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        reason: _Reason = ""
         request_body = request.body
         json_params = (params or {}) if not isinstance(params, list) else params
         try:
-            if isinstance(request.body, bytes):
-                try:
-                    request_body = request.body.decode("utf-8")
-                except UnicodeDecodeError:
-                    request_body = gzip.decompress(request.body).decode("utf-8")
-            json_body = json_module.loads(request_body) if request_body else {}
+            json_body = get_parsed_body(request).json
 
             if (
                 not strict_match
@@ -153,39 +522,178 @@ def json_params_matcher(
             valid = params is None if request_body is None else json_params == json_body
 
             if not valid:
-                reason = f"request.body doesn't match: {json_body} doesn't match {json_params}"
+                template = "request.body doesn't match: {} doesn't match {}"
                 if not strict_match:
-                    reason += (
+                    template += (
                         "\nNote: You use non-strict parameters check, "
                         "to change it use `strict_match=True`."
                     )
+                reason = LazyReason(template, json_body, json_params)
 
         except JSONDecodeError:
             valid = False
             reason = (
                 "request.body doesn't match: JSONDecodeError: Cannot parse request.body"
             )
+        except UnreadableBodyError as exc:
+            valid = False
+            reason = f"request.body doesn't match: {exc}"
 
         return valid, reason
 
+    if isinstance(params, Mapping):
+        match.constraints = MatcherConstraints(  # type: ignore[attr-defined]
+            json_keys=params
+        )
+    return match
+
+
+_JSON_PATH_TOKEN = re.compile(
+    r"""\.(?P<key>[^.\[\]]+)|\[(?P<index>-?\d+)\]|\[(?P<quote>["'])(?P<quoted>.*?)(?P=quote)\]"""
+)
+_NOT_FOUND = object()
+
+
+def _compile_json_path(path: str) -> Tuple[Union[str, int], ...]:
+    """Compile a JSON path into a tuple of dict keys and list indices.
+
+    Keys are separated by dots, list elements are accessed by ``[index]`` and keys
+    containing special characters are quoted, e.g. ``data.items[0]["x.y"]``. The
+    leading ``$`` is optional.
+
+    >>> _compile_json_path("$.data.items[-1].id")
+    ('data', 'items', -1, 'id')
+
+    """
+    source = path[1:] if path.startswith("$") else path
+    if source and source[0] not in ".[":
+        source = "." + source
+
+    accessors: List[Union[str, int]] = []
+    position = 0
+    while position < len(source):
+        token = _JSON_PATH_TOKEN.match(source, position)
+        if token is None:
+            raise ValueError(f"Invalid JSON path {path!r} at position {position}")
+        if token.group("key") is not None:
+            accessors.append(token.group("key"))
+        elif token.group("index") is not None:
+            accessors.append(int(token.group("index")))
+        else:
+            accessors.append(token.group("quoted"))
+        position = token.end()
+
+    if not accessors:
+        raise ValueError(f"JSON path {path!r} is empty")
+    return tuple(accessors)
+
+
+def _resolve_json_path(document: Any, accessors: Tuple[Union[str, int], ...]) -> Any:
+    value = document
+    for accessor in accessors:
+        if isinstance(accessor, int):
+            if not isinstance(value, list) or not -len(value) <= accessor < len(value):
+                return _NOT_FOUND
+        elif not isinstance(value, dict) or accessor not in value:
+            return _NOT_FOUND
+        value = value[accessor]
+    return value
+
+
+def json_path_matcher(
+    paths: Mapping[str, Union[Any, Pattern[str], Callable[[Any], bool]]]
+) -> Callable[..., Any]:
+    """Matches values at the given paths of the JSON encoded request body.
+
+    Paths are compiled when the matcher is created and only the given paths of the
+    parsed body are visited, other parts of the body are ignored.
+
+    >>> matcher = json_path_matcher({
+    ...     "operationName": "GetUser",
+    ...     "variables.ids[0]": re.compile(r"\\d+"),
+    ...     "variables.limit": lambda limit: limit <= 100,
+    ... })
+
+    Parameters
+    ----------
+    paths : dict
+        Expected values by JSON path. Paths are dot separated keys with ``[index]``
+        accessors for list elements, keys with special characters are quoted, e.g.
+        ``data["key.with.dots"]``. An expected value can be a ``re.Pattern`` matched
+        against a string value or a callable that accepts the value and returns
+        ``True`` if it matches.
+
+    Returns
+    -------
+    Callable
+        Matcher function.
+
+    """
+    compiled = [
+        (path, _compile_json_path(path), expected) for path, expected in paths.items()
+    ]
+
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        try:
+            json_body = get_parsed_body(request).json
+        except JSONDecodeError:
+            return (
+                False,
+                "request.body doesn't match: JSONDecodeError: Cannot parse request.body",
+            )
+        except UnreadableBodyError as exc:
+            return False, f"request.body doesn't match: {exc}"
+
+        for path, accessors, expected in compiled:
+            value = _resolve_json_path(json_body, accessors)
+            if value is _NOT_FOUND:
+                return False, LazyReason(
+                    "JSON path {} is not found in request.body", path
+                )
+
+            if isinstance(expected, re.Pattern):
+                valid = isinstance(value, str) and expected.match(value) is not None
+            elif callable(expected):
+                valid = bool(expected(value))
+            else:
+                valid = value == expected
+
+            if not valid:
+                return False, LazyReason(
+                    "JSON path {} doesn't match: {} doesn't match {}",
+                    path,
+                    value,
+                    expected,
+                )
+
+        return True, ""
+
+    match.constraints = MatcherConstraints(  # type: ignore[attr-defined]
+        json_keys=[
+            accessors[0]
+            for _, accessors, _ in compiled
+            if isinstance(accessors[0], str)
+        ]
+    )
     return match
 
 
 def fragment_identifier_matcher(identifier: Optional[str]) -> Callable[..., Any]:
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        reason = ""
-        url_fragment = urlparse(request.url).fragment
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        reason: _Reason = ""
+        url_fragment = get_parsed_url(request).fragment
         if identifier:
-            url_fragment_qsl = sorted(parse_qsl(url_fragment))  # type: ignore[type-var]
+            url_fragment_qsl = sorted(parse_qsl(url_fragment))
             identifier_qsl = sorted(parse_qsl(identifier))
             valid = identifier_qsl == url_fragment_qsl
         else:
             valid = not url_fragment
 
         if not valid:
-            reason = (
-                "URL fragment identifier is different: "  # type: ignore[str-bytes-safe]
-                f"{identifier} doesn't match {url_fragment}"
+            reason = LazyReason(
+                "URL fragment identifier is different: {} doesn't match {}",
+                identifier,
+                url_fragment,
             )
 
         return valid, reason
@@ -221,28 +729,48 @@ def query_param_matcher(
         if isinstance(v, (int, float)):
             params_dict[k] = str(v)
 
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        reason = ""
+    expected: Optional[FrozenSet[Tuple[Any, Any]]]
+    try:
+        expected = canonical_params(params_dict)
+    except TypeError:
+        # unhashable values are compared as mappings
+        expected = None
+
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        reason: _Reason = ""
         request_params = request.params  # type: ignore[attr-defined]
         request_params_dict = request_params or {}
 
         if not strict_match:
-            # filter down to just the params specified in the matcher
-            request_params_dict = {
-                k: v for k, v in request_params_dict.items() if k in params_dict
-            }
-
-        valid = sorted(params_dict.items()) == sorted(request_params_dict.items())
+            valid = all(
+                k in request_params_dict and request_params_dict[k] == v
+                for k, v in params_dict.items()
+            )
+        elif expected is not None:
+            # canonical forms cache their hash, unequal forms differ in most cases
+            request_canonical = get_canonical_params(request)
+            valid = hash(expected) == hash(request_canonical) and (
+                expected == request_canonical
+            )
+        else:
+            valid = params_dict == request_params_dict
 
         if not valid:
-            reason = f"Parameters do not match. {request_params_dict} doesn't match {params_dict}"
             if not strict_match:
-                reason += (
+                # filter down to just the params specified in the matcher
+                request_params_dict = _Deferred(
+                    _filter_params, request_params_dict, params_dict
+                )
+            template = "Parameters do not match. {} doesn't match {}"
+            if not strict_match:
+                template += (
                     "\nYou can use `strict_match=True` to do a strict parameters check."
                 )
+            reason = LazyReason(template, request_params_dict, params_dict)
 
         return valid, reason
 
+    match.constraints = MatcherConstraints(query=params_dict)  # type: ignore[attr-defined]
     return match
 
 
@@ -254,20 +782,26 @@ def query_string_matcher(query: Optional[str]) -> Callable[..., Any]:
     :return: (func) matcher
     """
 
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        reason = ""
-        data = parse_url(request.url or "")
-        request_query = data.query
+    expected = canonical_query(query)
 
-        request_qsl = sorted(parse_qsl(request_query)) if request_query else {}
-        matcher_qsl = sorted(parse_qsl(query)) if query else {}
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        reason: _Reason = ""
+        parsed_url = get_parsed_url(request)
+        request_query = parsed_url.query
 
-        valid = not query if request_query is None else request_qsl == matcher_qsl
+        if request_query is None:
+            valid = not query
+        else:
+            request_canonical = parsed_url.canonical_query
+            valid = hash(expected) == hash(request_canonical) and (
+                expected == request_canonical
+            )
 
         if not valid:
-            reason = (
-                "Query string doesn't match. "
-                f"{dict(request_qsl)} doesn't match {dict(matcher_qsl)}"
+            reason = LazyReason(
+                "Query string doesn't match. {} doesn't match {}",
+                _Deferred(_sorted_query, request_query),
+                _Deferred(_sorted_query, query),
             )
 
         return valid, reason
@@ -283,8 +817,8 @@ def request_kwargs_matcher(kwargs: Optional[Mapping[str, Any]]) -> Callable[...,
     :return: (func) matcher
     """
 
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        reason = ""
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        reason: _Reason = ""
         kwargs_dict = kwargs or {}
         # validate only kwargs that were requested for comparison, skip defaults
         req_kwargs = request.req_kwargs  # type: ignore[attr-defined]
@@ -297,8 +831,10 @@ def request_kwargs_matcher(kwargs: Optional[Mapping[str, Any]]) -> Callable[...,
         )
 
         if not valid:
-            reason = (
-                f"Arguments don't match: {request_kwargs} doesn't match {kwargs_dict}"
+            reason = LazyReason(
+                "Arguments don't match: {} doesn't match {}",
+                request_kwargs,
+                kwargs_dict,
             )
 
         return valid, reason
@@ -312,7 +848,8 @@ def multipart_matcher(
     """
     Matcher to match 'multipart/form-data' content-type.
     This function constructs request body and headers from provided 'data' and 'files'
-    arguments and compares to actual request
+    arguments and compares them to the actual request. Bodies are compared part by
+    part, the request body is parsed once per request.
 
     :param files: (dict), same as provided to request
     :param data: (dict), same as provided to request
@@ -337,54 +874,68 @@ def multipart_matcher(
 
         return content_type.split("boundary=")[1]
 
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
+    prepared_boundary = get_boundary(prepared.headers["Content-Type"])
+    # compared part by part, the boundary is random and differs between requests
+    expected_parts = parse_multipart(prepared.body or "", prepared_boundary)
+    assert expected_parts is not None
+
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
         reason = "multipart/form-data doesn't match. "
         if "Content-Type" not in request.headers:
             return False, reason + "Request is missing the 'Content-Type' header"
 
-        request_boundary = get_boundary(request.headers["Content-Type"])
-        prepared_boundary = get_boundary(prepared.headers["Content-Type"])
-
-        # replace boundary value in header and in body, since by default
-        # urllib3.filepost.encode_multipart_formdata dynamically calculates
-        # random boundary alphanumeric value
         request_content_type = request.headers["Content-Type"]
+        request_boundary = get_boundary(request_content_type)
         prepared_content_type = prepared.headers["Content-Type"].replace(
             prepared_boundary, request_boundary
         )
 
-        request_body = request.body
-        prepared_body = prepared.body or ""
-
-        if isinstance(prepared_body, bytes):
-            # since headers always come as str, need to convert to bytes
-            prepared_boundary = prepared_boundary.encode("utf-8")  # type: ignore[assignment]
-            request_boundary = request_boundary.encode("utf-8")  # type: ignore[assignment]
-
-        prepared_body = prepared_body.replace(
-            prepared_boundary, request_boundary  # type: ignore[arg-type]
-        )
-
         headers_valid = prepared_content_type == request_content_type
         if not headers_valid:
-            return (
-                False,
-                reason
-                + "Request headers['Content-Type'] is different. {} isn't equal to {}".format(
-                    request_content_type, prepared_content_type
-                ),
+            return False, LazyReason(
+                reason + "Request headers['Content-Type'] is different. "
+                "{} isn't equal to {}",
+                request_content_type,
+                prepared_content_type,
             )
 
-        body_valid = prepared_body == request_body
-        if not body_valid:
-            return (
-                False,
-                reason
-                + "Request body differs. {} aren't equal {}".format(  # type: ignore[str-bytes-safe]
-                    request_body, prepared_body
-                ),
+        reason += "Request body differs. "
+        try:
+            request_parts = get_parsed_body(request).multipart(request_boundary)
+        except UnreadableBodyError as exc:
+            return False, reason + str(exc)
+        if request_parts is None:
+            return False, reason + "Request body is not valid multipart/form-data"
+
+        if len(request_parts) != len(expected_parts):
+            return False, LazyReason(
+                reason + "Parts {} aren't equal {}",
+                _Deferred(_join_parts, request_parts),
+                _Deferred(_join_parts, expected_parts),
             )
 
+        for request_part, expected_part in zip(request_parts, expected_parts):
+            if request_part.headers != expected_part.headers:
+                return False, LazyReason(
+                    reason + "Part {} headers {} aren't equal {}",
+                    expected_part,
+                    _Deferred(dict, request_part.headers),
+                    _Deferred(dict, expected_part.headers),
+                )
+            if (request_part.digest, request_part.length) != (
+                expected_part.digest,
+                expected_part.length,
+            ):
+                return False, LazyReason(
+                    reason
+                    + "Part {} content {} ({} bytes) isn't equal to {} ({} bytes)",
+                    expected_part,
+                    request_part.preview,
+                    request_part.length,
+                    expected_part.preview,
+                    expected_part.length,
+                )
+
         return True, ""
 
     return match
@@ -399,7 +950,7 @@ def header_matcher(
     Because ``requests`` will send several standard headers in addition to what
     was specified by your code, request headers that are additional to the ones
     passed to the matcher are ignored by default. You can change this behaviour
-    by passing ``strict_match=True``.
+    by passing ``strict_match=True``. Header names are case-insensitive.
 
     :param headers: (dict), same as provided to request
     :param strict_match: (bool), whether headers in addition to those specified
@@ -407,38 +958,42 @@ def header_matcher(
     :return: (func) matcher
     """
 
-    def _compare_with_regex(request_headers: Union[Mapping[Any, Any], Any]) -> bool:
+    # prepared once, request headers are looked up case-insensitively without copying
+    expected = [(name.lower(), value) for name, value in headers.items()]
+    expected_names = frozenset(name for name, _ in expected)
+
+    def _compare(request_headers: CaseInsensitiveDict) -> bool:  # type: ignore[type-arg]
         if strict_match and len(request_headers) != len(headers):
             return False
 
-        for k, v in headers.items():
-            if request_headers.get(k) is not None:
-                if isinstance(v, re.Pattern):
-                    if re.match(v, request_headers[k]) is None:
-                        return False
-                else:
-                    if not v == request_headers[k]:
-                        return False
-            else:
+        for name, value in expected:
+            request_value = request_headers.get(name)
+            if request_value is None:
+                return False
+            if isinstance(value, re.Pattern):
+                if value.match(request_value) is None:
+                    return False
+            elif not value == request_value:
                 return False
 
         return True
 
-    def match(request: PreparedRequest) -> Tuple[bool, str]:
-        request_headers: Union[Mapping[Any, Any], Any] = request.headers or {}
-
-        if not strict_match:
-            # filter down to just the headers specified in the matcher
-            request_headers = {k: v for k, v in request_headers.items() if k in headers}
-
-        valid = _compare_with_regex(request_headers)
+    def match(request: PreparedRequest) -> Tuple[bool, _Reason]:
+        request_headers: Any = request.headers or {}
+        if not isinstance(request_headers, CaseInsensitiveDict):
+            request_headers = CaseInsensitiveDict(request_headers)
 
-        if not valid:
-            return (
-                False,
-                f"Headers do not match: {request_headers} doesn't match {headers}",
+        if not _compare(request_headers):
+            if not strict_match:
+                # filter down to just the headers specified in the matcher
+                request_headers = _Deferred(
+                    _filter_headers, request_headers, expected_names
+                )
+            return False, LazyReason(
+                "Headers do not match: {} doesn't match {}", request_headers, headers
             )
 
-        return valid, ""
+        return True, ""
 
+    match.constraints = MatcherConstraints(headers=headers)  # type: ignore[attr-defined]
     return match
@@ -1,75 +1,692 @@
-import copy
+import hashlib
+import operator
+import re
+from collections import OrderedDict
+from collections import deque
+from threading import RLock
 from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
 
+from responses._request import get_parsed_url
+from responses.matchers import MatcherConstraints
+from responses.matchers import get_constraints
+
 if TYPE_CHECKING:  # pragma: no cover
     # import only for linter run
     from requests import PreparedRequest
 
     from responses import BaseResponse
+    from responses.matchers import _Reason
+
+_IndexKey = Tuple[str, str]
+# index key, method and pattern prefix, equality key of a tracked response
+_RoutingKeys = Tuple[Optional[_IndexKey], Optional[_IndexKey], Optional[_IndexKey]]
+
+# candidate responses of a request with a copy of their matchers
+_Candidates = Tuple[Tuple["BaseResponse", Tuple[Any, ...]], ...]
+
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]|()\\")
+_REGEX_QUANTIFIERS = frozenset("*+?{")
+
+
+def _has_default_matching(response: "BaseResponse") -> bool:
+    """Check that the response is matched by ``BaseResponse`` logic.
+
+    Custom matching logic might accept requests outside of the lookup structures,
+    such responses are evaluated on every request.
+    """
+    from responses import BaseResponse
+
+    response_cls = type(response)
+    return (
+        response_cls.matches is BaseResponse.matches
+        and response_cls._url_matches is BaseResponse._url_matches
+    )
+
+
+def _evaluate(
+    response: "BaseResponse", request: "PreparedRequest"
+) -> Tuple[bool, "_Reason"]:
+    """Match the request, keeping ``LazyReason`` of the matchers unformatted."""
+    from responses import BaseResponse
+
+    if type(response).matches is BaseResponse.matches:
+        return response._matches(request)
+    return response.matches(request)
+
+
+def _routing_changes() -> int:
+    """Count of reassignments of ``url`` or ``method`` of any response."""
+    from responses import BaseResponse
+
+    return BaseResponse._routing_changes
+
+
+def _response_index_key(response: "BaseResponse") -> Optional[_IndexKey]:
+    """Build the lookup key of a response registered with a plain string URL.
+
+    Returns ``None`` for responses that cannot be indexed, e.g. responses with
+    ``re.Pattern`` URLs or responses that customize URL matching.
+    """
+    if not isinstance(response.url, str) or not _has_default_matching(response):
+        return None
+
+    return response.method, response._get_url_and_path_cached()
+
+
+def _request_index_key(request: "PreparedRequest") -> _IndexKey:
+    return str(request.method), get_parsed_url(request).url_and_path
+
+
+def _response_constraints(
+    response: "BaseResponse",
+) -> Optional[MatcherConstraints]:
+    """Combine the constraints of the response matchers.
+
+    Returns ``None`` if the constraints can't be used to skip the response.
+    """
+    if not isinstance(response.match, (list, tuple)) or not _has_default_matching(
+        response
+    ):
+        return None
+
+    return get_constraints(response.match) or None
+
+
+def _same_matchers(matchers: Tuple[Any, ...], match: Any) -> bool:
+    """Check that ``match`` holds the same matcher objects as ``matchers``."""
+    if not isinstance(match, (list, tuple)) or len(match) != len(matchers):
+        return False
+    return all(map(operator.is_, match, matchers))
+
+
+def _matchers_snapshot(match: Any) -> Tuple[Any, ...]:
+    """Copy the matchers to compare them with ``_same_matchers`` later."""
+    # other iterables, e.g. generators, are never considered the same
+    return tuple(match) if isinstance(match, (list, tuple)) else ()
+
+
+def _equality_key(response: "BaseResponse") -> Optional[_IndexKey]:
+    """Build the key that equal responses share, see ``BaseResponse.__eq__``.
+
+    Returns ``None`` for responses that customize the comparison.
+    """
+    from responses import BaseResponse
+
+    if type(response).__eq__ is not BaseResponse.__eq__:
+        return None
+
+    url = response.url
+    return response.method, url.pattern if isinstance(url, re.Pattern) else url
+
+
+def _remove_identical(
+    responses: List["BaseResponse"], response: "BaseResponse"
+) -> None:
+    for i, resp in enumerate(responses):
+        if resp is response:
+            del responses[i]
+            break
+
+
+def _insert_ordered(
+    responses: List["BaseResponse"], response: "BaseResponse", order: Dict[int, int]
+) -> None:
+    """Insert the response keeping the list in registration order."""
+    position = len(responses)
+    while position and order[id(responses[position - 1])] > order[id(response)]:
+        position -= 1
+    responses.insert(position, response)
+
+
+def _remove_from_bucket(
+    buckets: Dict[_IndexKey, List["BaseResponse"]],
+    key: _IndexKey,
+    response: "BaseResponse",
+) -> None:
+    bucket = buckets.get(key)
+    if bucket is None:
+        return
+    _remove_identical(bucket, response)
+    if not bucket:
+        del buckets[key]
+
+
+def _has_toplevel_alternation(source: str) -> bool:
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in source:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
+def _literal_prefix(pattern: "re.Pattern[str]") -> Optional[str]:
+    """Get the literal string that every match of the URL pattern starts with.
+
+    The pattern is analyzed conservatively: when in doubt a shorter prefix is
+    returned. ``None`` is returned for patterns that cannot be dispatched by
+    prefix at all.
+
+    Examples
+    --------
+    >>> _literal_prefix(re.compile(r"http://example\\.com/api/\\d+"))
+    "http://example.com/api/"
+
+    """
+    source = pattern.pattern
+    if not isinstance(source, str):
+        return None
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE) or _has_toplevel_alternation(
+        source
+    ):
+        return ""
+
+    prefix = []
+    # ``re.Pattern.match`` is always anchored at the beginning
+    i = 1 if source.startswith("^") else 0
+    while i < len(source):
+        char = source[i]
+        step = 1
+        if char == "\\":
+            if i + 1 == len(source) or source[i + 1].isalnum():
+                # character classes like \d or escapes like \n
+                break
+            char = source[i + 1]
+            step = 2
+        elif char in _REGEX_SPECIAL_CHARS:
+            break
+
+        following = i + step
+        if following < len(source) and source[following] in _REGEX_QUANTIFIERS:
+            # the character is optional or repeated
+            break
+        prefix.append(char)
+        i += step
+
+    return "".join(prefix)
+
+
+def _modifies(name: str) -> Callable[..., Any]:
+    """Wrap the list method to apply the modification to the registry."""
+    method = getattr(list, name)
+
+    def modify(self: "_RegisteredResponses", *args: Any, **kwargs: Any) -> Any:
+        registry = self._registry
+        with registry._lock:
+            if self is not registry._registered:
+                # the list was detached by `reset` or by assigning `registered`
+                return method(self, *args, **kwargs)
+            registry._sync_registered()
+            result = method(self, *args, **kwargs)
+            registry._load_registered()
+        return result
+
+    modify.__name__ = name
+    modify.__doc__ = method.__doc__
+    return modify
+
+
+class _RegisteredResponses(List["BaseResponse"]):
+    """List of the registered responses returned by ``registered``.
+
+    The registry keeps the list up to date. Custom registries may modify it in
+    place, e.g. ``self.registered.pop(0)``, the lookup structures of the registry
+    are rebuilt from the list after every modification.
+    """
+
+    __slots__ = ("_registry",)
+
+    def __init__(
+        self, registry: "FirstMatchRegistry", responses: Iterable["BaseResponse"] = ()
+    ) -> None:
+        super().__init__(responses)
+        self._registry = registry
+
+    append = _modifies("append")
+    extend = _modifies("extend")
+    insert = _modifies("insert")
+    pop = _modifies("pop")
+    remove = _modifies("remove")
+    clear = _modifies("clear")
+    sort = _modifies("sort")
+    reverse = _modifies("reverse")
+    __setitem__ = _modifies("__setitem__")
+    __delitem__ = _modifies("__delitem__")
+    __iadd__ = _modifies("__iadd__")
+    __imul__ = _modifies("__imul__")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # copies are regular lists
+        return list, (list(self),)
+
+
+class _TrieNode:
+    __slots__ = ("children", "responses")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.responses: List["BaseResponse"] = []
+
+
+class _PrefixTrie:
+    """Responses with ``re.Pattern`` URLs keyed by the literal prefix of the pattern.
+
+    A single pass over the request URL collects responses whose pattern could
+    match it. Patterns with a different prefix are never evaluated.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    def add(self, prefix: str, response: "BaseResponse") -> None:
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, _TrieNode())
+        node.responses.append(response)
+
+    def remove(self, prefix: str, response: "BaseResponse") -> None:
+        path = [self._root]
+        for char in prefix:
+            child = path[-1].children.get(char)
+            if child is None:
+                return
+            path.append(child)
+
+        responses = path[-1].responses
+        for i, resp in enumerate(responses):
+            if resp is response:
+                del responses[i]
+                break
+
+        # prune nodes that don't lead to any response
+        for char, parent, node in zip(reversed(prefix), path[-2::-1], path[::-1]):
+            if node.responses or node.children:
+                break
+            del parent.children[char]
+
+    def find(self, url: str) -> List["BaseResponse"]:
+        node = self._root
+        found = list(node.responses)
+        for char in url:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+            found.extend(node.responses)
+        return found
 
 
 class FirstMatchRegistry:
     def __init__(self) -> None:
-        self._responses: List["BaseResponse"] = []
+        # responses in registration order, the list is returned by `registered`
+        self._registered = _RegisteredResponses(self)
+        # responses with plain string URLs grouped by method and normalized URL,
+        # responses with URL patterns dispatched by method and literal prefix,
+        # all other responses are checked on every request
+        self._index: Dict[_IndexKey, List["BaseResponse"]] = {}
+        self._patterns: Dict[str, _PrefixTrie] = {}
+        self._unindexed: List["BaseResponse"] = []
+        # responses grouped by `BaseResponse.__eq__` key for remove and replace
+        self._equal: Dict[_IndexKey, List["BaseResponse"]] = {}
+        self._unkeyed: List["BaseResponse"] = []
+        # matchers and their combined constraints by response identity, responses
+        # that don't satisfy the constraints are skipped without calling matchers
+        self._constraints: Dict[int, Tuple[Tuple[Any, ...], MatcherConstraints]] = {}
+        # registration sequence of every registered response by its identity
+        self._order: Dict[int, int] = {}
+        self._next_order = 0
+        # keys the responses are tracked with, responses whose URL or method is
+        # reassigned after registration are tracked again
+        self._routing: Dict[int, _RoutingKeys] = {}
+        self._routing_changes = _routing_changes()
+        # lookups run without the lock and are retried if the version has changed,
+        # only modifications of the registry are serialized
+        self._lock = RLock()
+        self._version = 0
 
     @property
     def registered(self) -> List["BaseResponse"]:
-        return self._responses
+        self._sync_registered()
+        return self._registered
+
+    @registered.setter
+    def registered(self, responses: Iterable["BaseResponse"]) -> None:
+        with self._lock:
+            self._registered = _RegisteredResponses(self, responses)
+            self._load_registered()
 
     def reset(self) -> None:
-        self._responses = []
+        self.registered = []
 
-    def find(
+    def _sync_registered(self) -> None:
+        """Bring the ``registered`` list up to date before it is used."""
+        # the list is updated along with the lookup structures
+
+    def _load_registered(self) -> None:
+        """Rebuild the lookup structures from the modified ``registered`` list."""
+        with self._lock:
+            self._index = {}
+            self._patterns = {}
+            self._unindexed = []
+            self._equal = {}
+            self._unkeyed = []
+            self._constraints = {}
+            self._order = {}
+            self._routing = {}
+            self._version += 1
+
+            registered = self._registered
+            for position, response in enumerate(registered):
+                if id(response) in self._order:
+                    # the same instance is listed twice, see `add`
+                    response = response._duplicate()
+                    list.__setitem__(registered, position, response)
+                self._track(response, position)
+            self._next_order = len(registered)
+
+    @staticmethod
+    def _pattern_prefix(response: "BaseResponse") -> Optional[str]:
+        if not isinstance(response.url, re.Pattern) or not _has_default_matching(
+            response
+        ):
+            return None
+        return _literal_prefix(response.url)
+
+    def _routing_keys(self, response: "BaseResponse") -> _RoutingKeys:
+        key = _response_index_key(response)
+        prefix = self._pattern_prefix(response) if key is None else None
+        return (
+            key,
+            (response.method, prefix) if prefix is not None else None,
+            _equality_key(response),
+        )
+
+    def _track(self, response: "BaseResponse", order: int) -> None:
+        """Add the response to the lookup structures."""
+        self._order[id(response)] = order
+        self._version += 1
+
+        constraints = _response_constraints(response)
+        if constraints is not None:
+            # a copy of the matchers, the list might be modified in place
+            self._constraints[id(response)] = (
+                _matchers_snapshot(response.match),
+                constraints,
+            )
+
+        routing = self._routing_keys(response)
+        self._routing[id(response)] = routing
+        key, pattern, equality_key = routing
+        if key is not None:
+            _insert_ordered(self._index.setdefault(key, []), response, self._order)
+        elif pattern is not None:
+            method, prefix = pattern
+            trie = self._patterns.setdefault(method, _PrefixTrie())
+            trie.add(prefix, response)
+        else:
+            _insert_ordered(self._unindexed, response, self._order)
+
+        if equality_key is not None:
+            bucket = self._equal.setdefault(equality_key, [])
+            _insert_ordered(bucket, response, self._order)
+        else:
+            _insert_ordered(self._unkeyed, response, self._order)
+
+    def _untrack(self, response: "BaseResponse") -> None:
+        """Remove the response from the lookup structures."""
+        self._order.pop(id(response), None)
+        self._constraints.pop(id(response), None)
+        self._version += 1
+
+        key, pattern, equality_key = self._routing.pop(id(response))
+        if pattern is not None:
+            method, prefix = pattern
+            if method in self._patterns:
+                self._patterns[method].remove(prefix, response)
+        elif key is not None:
+            _remove_from_bucket(self._index, key, response)
+        else:
+            _remove_identical(self._unindexed, response)
+
+        if equality_key is not None:
+            _remove_from_bucket(self._equal, equality_key, response)
+        else:
+            _remove_identical(self._unkeyed, response)
+
+    def _refresh_routing(self) -> None:
+        """Track responses again whose URL or method was reassigned."""
+        changes = _routing_changes()
+        if changes == self._routing_changes:
+            return
+
+        with self._lock:
+            for response in list(self._registered):
+                if self._routing[id(response)] != self._routing_keys(response):
+                    order = self._order[id(response)]
+                    self._untrack(response)
+                    self._track(response, order)
+            self._routing_changes = changes
+
+    def _sort_by_order(self, responses: List["BaseResponse"]) -> List["BaseResponse"]:
+        order = self._order
+        return sorted(responses, key=lambda resp: order.get(id(resp), -1))
+
+    def _candidates(self, request: "PreparedRequest") -> List["BaseResponse"]:
+        """Responses that might match the request, in registration order."""
+        key = _request_index_key(request)
+        # copy the lists, they might be modified by other threads during the lookup
+        bucket = list(self._index.get(key, ()))
+        trie = self._patterns.get(key[0])
+        patterns = trie.find(get_parsed_url(request)) if trie is not None else []
+        unindexed = list(self._unindexed)
+        if not patterns and not unindexed:
+            return bucket
+
+        return self._sort_by_order(bucket + patterns + unindexed)
+
+    def _may_match(self, response: "BaseResponse", request: "PreparedRequest") -> bool:
+        """Check the matcher constraints of the response, see ``MatcherConstraints``."""
+        entry = self._constraints.get(id(response))
+        if entry is None:
+            return True
+        matchers, constraints = entry
+        if not _same_matchers(matchers, response.match):
+            # matchers were modified after the response was registered
+            return True
+        return constraints.satisfied_by(request)
+
+    def _find_equal(self, response: "BaseResponse") -> List["BaseResponse"]:
+        """Registered responses equal to the given one, in registration order."""
+        key = _equality_key(response)
+        if key is None:
+            return [resp for resp in self._registered if resp == response]
+
+        equal = list(self._equal.get(key, ()))
+        if not self._unkeyed:
+            return equal
+        equal.extend(resp for resp in self._unkeyed if resp == response)
+        return self._sort_by_order(equal)
+
+    def _position(self, response: "BaseResponse") -> int:
+        """Position of the response in ``registered``, the list is sorted by order."""
+        order = self._order
+        target = order[id(response)]
+        registered = self._registered
+        low, high = 0, len(registered)
+        while low < high:
+            middle = (low + high) // 2
+            if order[id(registered[middle])] < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _pop(self, response: "BaseResponse") -> "BaseResponse":
+        list.__delitem__(self._registered, self._position(response))
+        self._untrack(response)
+        return response
+
+    def _match_candidates(
         self, request: "PreparedRequest"
-    ) -> Tuple[Optional["BaseResponse"], List[str]]:
-        found = None
+    ) -> Tuple[
+        Optional["BaseResponse"], Optional["BaseResponse"], Dict[int, "_Reason"]
+    ]:
+        """Evaluate candidates until the second match is found.
+
+        Returns the mismatch reasons of the evaluated candidates by their identity,
+        in evaluation order. Runs without holding the lock, the registry is not
+        modified.
+        """
         found_match = None
-        match_failed_reasons = []
-        for i, response in enumerate(self.registered):
-            match_result, reason = response.matches(request)
-            if match_result:
-                if found is None:
-                    found = i
-                    found_match = response
-                else:
-                    if self.registered[found].call_count > 0:
-                        # that assumes that some responses were added between calls
-                        self.registered.pop(found)
-                        found_match = response
-                        break
-                    # Multiple matches found.  Remove & return the first response.
-                    return self.registered.pop(found), match_failed_reasons
+        match_failed_reasons: Dict[int, "_Reason"] = {}
+        for response in self._candidates(request):
+            if not self._may_match(response, request):
+                continue
+            match_result, reason = _evaluate(response, request)
+            if not match_result:
+                match_failed_reasons[id(response)] = reason
+            elif found_match is None:
+                found_match = response
             else:
-                match_failed_reasons.append(reason)
-        return found_match, match_failed_reasons
+                return found_match, response, match_failed_reasons
+        return found_match, None, match_failed_reasons
+
+    def find(
+        self, request: "PreparedRequest"
+    ) -> Tuple[Optional["BaseResponse"], List["_Reason"]]:
+        self._refresh_routing()
+        while True:
+            version = self._version
+            found_match, next_match, match_failed_reasons = self._match_candidates(
+                request
+            )
+            with self._lock:
+                if version != self._version:
+                    # registry was modified while matching, e.g. by another thread
+                    continue
+                if found_match is None:
+                    registered = list(self._registered)
+                    break
+                # reasons of a successful lookup are rarely displayed, they are
+                # returned unformatted
+                reasons = list(match_failed_reasons.values())
+                if next_match is None:
+                    return found_match, reasons
+                if found_match.call_count > 0:
+                    # that assumes that some responses were added between calls
+                    self._pop(found_match)
+                    return next_match, reasons
+                # Multiple matches found.  Remove & return the first response.
+                return self._pop(found_match), reasons
+
+        # report a reason for every registered response, matchers of the evaluated
+        # candidates are not called again
+        return None, [
+            str(match_failed_reasons[id(response)])
+            if id(response) in match_failed_reasons
+            else response.matches(request)[1]
+            for response in registered
+        ]
 
     def add(self, response: "BaseResponse") -> "BaseResponse":
-        if any(response is resp for resp in self.registered):
-            # if user adds multiple responses that reference the same instance.
-            # do a comparison by memory allocation address.
-            # see https://github.com/getsentry/responses/issues/479
-            response = copy.deepcopy(response)
+        with self._lock:
+            # `_order` is keyed by the identity of every registered response
+            if id(response) in self._order:
+                # if user adds multiple responses that reference the same instance.
+                # do a comparison by memory allocation address.
+                # see https://github.com/getsentry/responses/issues/479
+                response = response._duplicate()
 
-        self.registered.append(response)
-        return response
+            list.append(self._registered, response)
+            self._track(response, self._next_order)
+            self._next_order += 1
+            return response
+
+    def add_many(self, responses: Iterable["BaseResponse"]) -> List["BaseResponse"]:
+        """Register multiple responses at once.
+
+        Duplicated instances are detected with a single identity set and the lookup
+        structures are updated once all responses are validated. Subclasses that
+        override ``add`` get each response passed to ``add`` instead.
+
+        Parameters
+        ----------
+        responses : Iterable[BaseResponse]
+            Responses to register, in order.
+
+        Returns
+        -------
+        List[BaseResponse]
+            Registered responses. Contains copies of instances that were already
+            registered, see ``add``.
+
+        """
+        if type(self).add is not FirstMatchRegistry.add:
+            # a subclass customizes registration, don't bypass it
+            return [self.add(response) for response in responses]
+
+        with self._lock:
+            registered_ids = set(self._order)
+            added = []
+            for response in responses:
+                if id(response) in registered_ids:
+                    response = response._duplicate()
+                registered_ids.add(id(response))
+                added.append(response)
+
+            list.extend(self._registered, added)
+            for response in added:
+                self._track(response, self._next_order)
+                self._next_order += 1
+            return added
 
     def remove(self, response: "BaseResponse") -> List["BaseResponse"]:
-        removed_responses = []
-        while response in self.registered:
-            self.registered.remove(response)
-            removed_responses.append(response)
-        return removed_responses
+        with self._lock:
+            self._refresh_routing()
+            removed_responses = []
+            for registered_response in self._find_equal(response):
+                self._pop(registered_response)
+                removed_responses.append(response)
+            return removed_responses
 
     def replace(self, response: "BaseResponse") -> "BaseResponse":
-        try:
-            index = self.registered.index(response)
-        except ValueError:
-            raise ValueError(f"Response is not registered for URL {response.url}")
-        self.registered[index] = response
-        return response
+        with self._lock:
+            self._refresh_routing()
+            equal = self._find_equal(response)
+            if not equal:
+                raise ValueError(f"Response is not registered for URL {response.url}")
+            replaced = equal[0]
+            if response is not replaced and id(response) in self._order:
+                # the instance is registered at another position, see `add`
+                response = response._duplicate()
+            order = self._order[id(replaced)]
+            list.__setitem__(self._registered, self._position(replaced), response)
+            self._untrack(replaced)
+            self._track(response, order)
+            return response
 
 
 class OrderedRegistry(FirstMatchRegistry):
@@ -79,13 +696,42 @@ class OrderedRegistry(FirstMatchRegistry):
     the same order in which they were added to the registry. Otherwise, an error is returned.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        # responses are consumed from the head, thus kept in a deque instead of a list
+        self._queue: Deque["BaseResponse"] = deque()
+        self._queued_ids: Set[int] = set()
+        # `registered` is brought up to date with the queue when it is read
+        self._registered_stale = False
+
+    def _sync_registered(self) -> None:
+        if self._registered_stale:
+            with self._lock:
+                list.__setitem__(self._registered, slice(None), self._queue)
+                self._registered_stale = False
+
+    def _load_registered(self) -> None:
+        queue: Deque["BaseResponse"] = deque()
+        queued_ids: Set[int] = set()
+        registered = self._registered
+        for position, response in enumerate(registered):
+            if id(response) in queued_ids:
+                # see https://github.com/getsentry/responses/issues/479
+                response = response._duplicate()
+                list.__setitem__(registered, position, response)
+            queue.append(response)
+            queued_ids.add(id(response))
+        self._queue = queue
+        self._queued_ids = queued_ids
+        self._registered_stale = False
+
     def find(
         self, request: "PreparedRequest"
-    ) -> Tuple[Optional["BaseResponse"], List[str]]:
+    ) -> Tuple[Optional["BaseResponse"], List["_Reason"]]:
         """Find the next registered `Response` and check if it matches the request.
 
-        Search is performed by taking the first element of the registered responses list
-        and removing this object (popping from the list).
+        Search is performed by taking the first element of the registered responses queue
+        and removing this object (popping from the queue).
 
         Parameters
         ----------
@@ -94,16 +740,18 @@ class OrderedRegistry(FirstMatchRegistry):
 
         Returns
         -------
-        Tuple[Optional["BaseResponse"], List[str]]
+        Tuple[Optional["BaseResponse"], List[Union[str, LazyReason]]]
             Matched `Response` object and empty list in case of match.
             Otherwise, None and a list with reasons for not finding a match.
 
         """
 
-        if not self.registered:
+        if not self._queue:
             return None, ["No more registered responses"]
 
-        response = self.registered.pop(0)
+        response = self._queue.popleft()
+        self._queued_ids.discard(id(response))
+        self._registered_stale = True
         match_result, reason = response.matches(request)
         if not match_result:
             self.reset()
@@ -115,3 +763,146 @@ class OrderedRegistry(FirstMatchRegistry):
             return None, [reason]
 
         return response, []
+
+    def add(self, response: "BaseResponse") -> "BaseResponse":
+        if id(response) in self._queued_ids:
+            # see https://github.com/getsentry/responses/issues/479
+            response = response._duplicate()
+
+        self._queue.append(response)
+        self._queued_ids.add(id(response))
+        self._registered_stale = True
+        return response
+
+    def add_many(self, responses: Iterable["BaseResponse"]) -> List["BaseResponse"]:
+        if type(self).add is not OrderedRegistry.add:
+            # a subclass customizes registration, don't bypass it
+            return [self.add(response) for response in responses]
+
+        added = []
+        for response in responses:
+            if id(response) in self._queued_ids:
+                response = response._duplicate()
+            self._queued_ids.add(id(response))
+            added.append(response)
+
+        self._queue.extend(added)
+        self._registered_stale = True
+        return added
+
+    def remove(self, response: "BaseResponse") -> List["BaseResponse"]:
+        removed_responses = [response for resp in self._queue if resp == response]
+        if removed_responses:
+            self._queue = deque(resp for resp in self._queue if resp != response)
+            self._queued_ids = {id(resp) for resp in self._queue}
+            self._registered_stale = True
+        return removed_responses
+
+    def replace(self, response: "BaseResponse") -> "BaseResponse":
+        try:
+            index = self._queue.index(response)
+        except ValueError:
+            raise ValueError(f"Response is not registered for URL {response.url}")
+        self._queued_ids.discard(id(self._queue[index]))
+        self._queue[index] = response
+        self._queued_ids.add(id(response))
+        self._registered_stale = True
+        return response
+
+
+def _request_fingerprint(request: "PreparedRequest") -> Optional[Hashable]:
+    """Build a canonical fingerprint of everything matchers can inspect.
+
+    Returns ``None`` for requests with file-like or iterable bodies, they can't be
+    fingerprinted without consuming them.
+    """
+    body = request.body
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if body is not None and not isinstance(body, bytes):
+        return None
+
+    headers = tuple(
+        sorted((name.lower(), value) for name, value in (request.headers or {}).items())
+    )
+    body_digest = hashlib.blake2b(body, digest_size=16).digest() if body else body
+    req_kwargs = getattr(request, "req_kwargs", None) or {}
+    return (
+        str(request.method),
+        str(request.url),
+        headers,
+        body_digest,
+        repr(sorted(req_kwargs.items())),
+    )
+
+
+class CachingRegistry(FirstMatchRegistry):
+    """``FirstMatchRegistry`` that memoizes the matched response by request fingerprint.
+
+    Repeated identical requests, e.g. in polling loops, are answered from an LRU
+    cache instead of evaluating matchers again. The fingerprint consists of method,
+    URL, headers, a digest of the body and the keyword arguments of the request.
+    The cache is invalidated whenever the registry changes, including removal of a
+    matched duplicate response. A cached response is looked up again when the
+    matchers of a response that could match the request are replaced or modified.
+
+    Only use it with deterministic matchers that depend on the request alone.
+    """
+
+    maxsize = 1024
+
+    def __init__(self) -> None:
+        super().__init__()
+        # matched response and the matchers of the candidates by fingerprint
+        self._cache: "OrderedDict[Hashable, Tuple[BaseResponse, _Candidates]]" = (
+            OrderedDict()
+        )
+        self._cache_version = self._version
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self) -> None:
+        with self._lock:
+            super().reset()
+            self._cache.clear()
+            self._cache_version = self._version
+
+    def find(
+        self, request: "PreparedRequest"
+    ) -> Tuple[Optional["BaseResponse"], List["_Reason"]]:
+        fingerprint = _request_fingerprint(request)
+        if fingerprint is None:
+            return super().find(request)
+
+        self._refresh_routing()
+        with self._lock:
+            if self._cache_version != self._version:
+                self._cache.clear()
+                self._cache_version = self._version
+            entry = self._cache.get(fingerprint)
+            if entry is not None:
+                response, candidates = entry
+                if all(
+                    _same_matchers(matchers, candidate.match)
+                    for candidate, matchers in candidates
+                ):
+                    self._cache.move_to_end(fingerprint)
+                    self.hits += 1
+                    return response, []
+                del self._cache[fingerprint]
+            self.misses += 1
+            version = self._version
+
+        found, match_failed_reasons = super().find(request)
+        with self._lock:
+            # popping a matched duplicate changes the version, such results are
+            # not cached, the next request gets a different response
+            if found is not None and version == self._version == self._cache_version:
+                candidates = tuple(
+                    (candidate, _matchers_snapshot(candidate.match))
+                    for candidate in self._candidates(request)
+                )
+                self._cache[fingerprint] = (found, candidates)
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return found, match_failed_reasons
@@ -1,15 +1,26 @@
 import gzip
+import hashlib
+import json
 import re
+import time
+import urllib.parse
 from typing import Any
+from typing import Dict
 from typing import List
 from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
 import requests
 from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
 
 import responses
 from responses import matchers
+from responses import registries
+from responses._request import get_canonical_params
+from responses._request import get_parsed_body
+from responses._request import parse_multipart
 from responses.tests.test_responses import assert_reset
 from responses.tests.test_responses import assert_response
 
@@ -453,6 +464,197 @@ def test_query_param_matcher_loose_fail():
     assert_reset()
 
 
+def test_query_matchers_canonical_form():
+    def request(url, params=None):
+        prepared = requests.Request("GET", url, params=params).prepare()
+        prepared.params = responses.mock._parse_request_params(  # type: ignore[attr-defined]
+            prepared.path_url
+        )
+        return prepared
+
+    ordered = matchers.query_string_matcher("b=2&a=1&a=3")
+    assert ordered(request("http://example.com/?a=3&b=2&a=1"))[0]
+    assert not ordered(request("http://example.com/?a=3&b=2"))[0]
+    assert not ordered(request("http://example.com/?a=3&b=2&a=1&a=1"))[0]
+    assert not ordered(request("http://example.com/"))[0]
+
+    empty = matchers.query_string_matcher(None)
+    assert empty(request("http://example.com/"))[0]
+    assert empty(request("http://example.com/?"))[0]
+    assert not empty(request("http://example.com/?a=1"))[0]
+
+    repeated = matchers.query_param_matcher({"a": ["1", "3"], "b": 2})
+    prepared = request("http://example.com/", params={"b": 2, "a": ["1", "3"]})
+    assert repeated(prepared)[0]
+    assert not repeated(request("http://example.com/?a=3&a=1&b=2"))[0]
+    assert not repeated(request("http://example.com/?a=1&b=2"))[0]
+    assert get_canonical_params(prepared) is get_canonical_params(prepared)
+
+    unhashable = matchers.query_param_matcher({"a": [["1"]]})
+    assert not unhashable(request("http://example.com/?a=1"))[0]
+
+
+def test_body_digest_matcher(tmp_path):
+    payload = b"x" * 200_000
+    sha256 = hashlib.sha256(payload).hexdigest()
+    path = tmp_path / "upload.bin"
+    path.write_bytes(payload)
+
+    def chunks():
+        for i in range(0, len(payload), 1000):
+            yield payload[i : i + 1000]  # noqa: E203
+
+    def run():
+        with responses.RequestsMock(read_filelike_body=False) as rsps:
+            rsps.post(
+                "http://example.com",
+                match=[matchers.body_digest_matcher(sha256.upper(), length=200_000)],
+            )
+            with open(path, "rb") as upload:
+                assert requests.post("http://example.com", data=upload).ok
+                # the file is left unread, at its original position
+                assert rsps.calls[0].request.body is upload  # type: ignore[comparison-overlap]
+                assert upload.tell() == 0
+
+            assert requests.post("http://example.com", data=payload).ok
+
+            # a generator is consumed once and replaced by a file
+            assert requests.post("http://example.com", data=chunks()).ok
+            assert rsps.calls[2].request.body.read() == payload
+
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.post("http://example.com", data=payload[1:])
+            assert (
+                "request.body digest doesn't match: sha256 "
+                f"{hashlib.sha256(payload[1:]).hexdigest()} (199999 bytes) "
+                f"doesn't match {sha256} (200000 bytes)"
+            ) in str(excinfo.value)
+
+        with responses.RequestsMock() as rsps:
+            blake2b = hashlib.blake2b(b"data").hexdigest()
+            rsps.post(
+                "http://example.com",
+                match=[matchers.body_digest_matcher(blake2b, algorithm="blake2b")],
+            )
+            assert requests.post("http://example.com", data="data").ok
+
+    run()
+    assert_reset()
+
+    with pytest.raises(ValueError):
+        matchers.body_digest_matcher(sha256, algorithm="unknown")
+
+
+def test_matchers_with_bytes_like_body():
+    def run():
+        with responses.RequestsMock() as rsps:
+            rsps.post(
+                "http://example.com",
+                match=[
+                    matchers.body_digest_matcher(
+                        hashlib.sha256(b'{"a": 1}').hexdigest(), length=8
+                    ),
+                    matchers.json_params_matcher({"a": 1}),
+                    matchers.body_matcher('{"a": 1}'),
+                ],
+            )
+            body = bytearray(b'{"a": 1}')
+            assert requests.post("http://example.com", data=body).ok  # type: ignore[arg-type]
+            assert requests.post("http://example.com", data=memoryview(b'{"a": 1}')).ok
+            assert isinstance(rsps.calls[0].request.body, bytearray)
+
+    run()
+    assert_reset()
+
+
+def test_matchers_with_filelike_body(tmp_path):
+    path = tmp_path / "upload.json"
+    path.write_bytes(b'{"a": 1}')
+
+    def run():
+        with responses.RequestsMock(read_filelike_body=False) as rsps:
+            rsps.post(
+                "http://example.com/json",
+                match=[
+                    matchers.json_params_matcher({"a": 1}),
+                    matchers.json_path_matcher({"$.a": 1}),
+                    matchers.body_matcher('{"a": 1}'),
+                ],
+            )
+            with open(path, "rb") as upload:
+                assert requests.post("http://example.com/json", data=upload).ok
+                # the file is read and rewound
+                assert upload.tell() == 0
+
+            # a generator can't be read without consuming it, matchers don't match
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.post(
+                    "http://example.com/json", data=(c for c in [b'{"a": 1}'])
+                )
+            assert (
+                "request.body doesn't match: request.body of type generator "
+                "can't be read without consuming it"
+            ) in str(excinfo.value)
+
+    run()
+    assert_reset()
+
+
+def test_json_path_matcher():
+    payload = {
+        "operationName": "GetUser",
+        "variables": {"ids": ["42", "43"], "limit": 10, "key.with.dots": None},
+        "extensions": {"large": "x" * 1000},
+    }
+
+    @responses.activate
+    def run():
+        responses.post(
+            "http://example.com",
+            body="list",
+            match=[
+                matchers.json_path_matcher(
+                    {
+                        "$.operationName": "GetUser",
+                        "variables.ids[-1]": re.compile(r"\d+"),
+                        "variables.limit": lambda limit: limit <= 100,
+                        'variables["key.with.dots"]': None,
+                    }
+                )
+            ],
+        )
+        responses.post(
+            "http://example.com",
+            body="root",
+            match=[matchers.json_path_matcher({"[1].id": 2})],
+        )
+
+        assert requests.post("http://example.com", json=payload).text == "list"
+        assert (
+            requests.post("http://example.com", json=[{"id": 1}, {"id": 2}]).text
+            == "root"
+        )
+
+        with pytest.raises(ConnectionError) as excinfo:
+            requests.post(
+                "http://example.com",
+                json={**payload, "variables": {"ids": ["42", "x"], "limit": 10}},
+            )
+        msg = str(excinfo.value)
+        assert "JSON path variables.ids[-1] doesn't match: x doesn't match" in msg
+        assert "JSON path [1].id is not found in request.body" in msg
+
+        with pytest.raises(ConnectionError) as excinfo:
+            requests.post("http://example.com", data="not json")
+        assert "JSONDecodeError: Cannot parse request.body" in str(excinfo.value)
+
+    run()
+    assert_reset()
+
+    with pytest.raises(ValueError):
+        matchers.json_path_matcher({"a..b": 1})
+
+
 def test_request_matches_empty_body():
     def run():
         with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
@@ -556,6 +758,310 @@ def test_request_matches_params():
     assert_reset()
 
 
+def test_lazy_reason():
+    reason = matchers.LazyReason("{} doesn't match {}", {"a": 1}, [2])
+    assert str(reason) == "{'a': 1} doesn't match [2]"
+    assert reason == "{'a': 1} doesn't match [2]"
+    assert reason == matchers.LazyReason("{} doesn't match [2]", {"a": 1})
+    assert reason != "something else"
+    assert str("Note: " + reason + ".") == "Note: {'a': 1} doesn't match [2]."
+    assert repr(reason) == repr("{'a': 1} doesn't match [2]")
+
+
+def test_lazy_reason_rendered_only_on_error():
+    class Formatted:
+        count = 0
+
+        def __format__(self, format_spec):
+            Formatted.count += 1
+            return "formatted"
+
+    def lazy_matcher(request):
+        return False, matchers.LazyReason("custom {}", Formatted())
+
+    @responses.activate
+    def run():
+        responses.get("http://example.com", match=[lazy_matcher])
+        responses.get(
+            "http://example.com", match=[matchers.query_param_matcher({"a": "b"})]
+        )
+        responses.get("http://example.com", match=[matchers.header_matcher({"A": "b"})])
+
+        requests.get("http://example.com", params={"a": "b"})
+        assert Formatted.count == 0
+
+        with pytest.raises(ConnectionError) as excinfo:
+            requests.get("http://example.com")
+
+        assert Formatted.count == 1
+        msg = str(excinfo.value)
+        assert "- GET http://example.com/ custom formatted" in msg
+        assert "Parameters do not match. {} doesn't match {'a': 'b'}" in msg
+        assert "Headers do not match: {} doesn't match {'A': 'b'}" in msg
+
+    run()
+    assert_reset()
+
+
+def test_lazy_reason_defers_request_data(monkeypatch):
+    parsed = []
+
+    def parse_qsl(query):
+        parsed.append(query)
+        return urllib.parse.parse_qsl(query)
+
+    monkeypatch.setattr(matchers, "parse_qsl", parse_qsl)
+    matcher = matchers.query_string_matcher("a=1&b=2")
+    request = requests.Request("GET", "http://example.com/?b=3").prepare()
+    valid, reason = matcher(request)
+    assert not valid
+    assert parsed == []
+
+    assert str(reason) == (
+        "Query string doesn't match. {'b': '3'} doesn't match {'a': '1', 'b': '2'}"
+    )
+    assert parsed == ["b=3", "a=1&b=2"]
+
+
+def test_header_matcher_filters_headers_lazily():
+    class Headers(CaseInsensitiveDict):  # type: ignore[type-arg]
+        listed = 0
+
+        def items(self):
+            Headers.listed += 1
+            return super().items()
+
+    matcher = matchers.header_matcher({"Accept": "application/json"})
+    request = requests.Request("GET", "http://example.com").prepare()
+    request.headers = Headers({"Accept": "text/plain", "X-Other": "1"})
+    valid, reason = matcher(request)
+    assert not valid
+    assert Headers.listed == 0
+
+    assert str(reason) == (
+        "Headers do not match: {'Accept': 'text/plain'} doesn't match "
+        "{'Accept': 'application/json'}"
+    )
+    assert Headers.listed == 1
+
+
+def test_query_param_matcher_filters_params_lazily():
+    class Params(Dict[str, str]):
+        listed = 0
+
+        def items(self):
+            Params.listed += 1
+            return super().items()
+
+    matcher = matchers.query_param_matcher({"a": "1"}, strict_match=False)
+    request = requests.Request("GET", "http://example.com/?a=2&b=3").prepare()
+    request.params = Params(a="2", b="3")  # type: ignore[attr-defined]
+    valid, reason = matcher(request)
+    assert not valid
+    assert Params.listed == 0
+
+    assert str(reason).startswith(
+        "Parameters do not match. {'a': '2'} doesn't match {'a': '1'}"
+    )
+    assert Params.listed == 1
+
+
+def test_matches_and_find_return_formatted_reasons():
+    response = responses.Response(
+        "GET", "http://example.com", match=[matchers.header_matcher({"A": "b"})]
+    )
+    request = requests.Request("GET", "http://example.com").prepare()
+    valid, reason = response.matches(request)
+    assert not valid
+    assert isinstance(reason, str)
+    assert "Headers" in reason
+
+    registry = registries.FirstMatchRegistry()
+    registry.add(response)
+    found, reasons = registry.find(request)
+    assert found is None
+    assert all(isinstance(reason, str) for reason in reasons)
+    assert reasons[0].startswith("Headers do not match:")
+
+
+def test_request_body_parsed_once():
+    body = gzip.compress(b'{"id": 1}')
+    loads = Mock(wraps=json.loads)
+
+    @responses.activate
+    def run():
+        for i in range(2, 12):
+            responses.post(
+                "http://example.com", match=[matchers.json_params_matcher({"id": i})]
+            )
+        responses.post(
+            "http://example.com", match=[matchers.json_params_matcher({"id": 1})]
+        )
+        backend = responses.JSONBackend("counting", json.dumps, loads)
+        with patch("responses._json._backend", backend):
+            resp = requests.post("http://example.com", data=body)
+
+        assert resp.status_code == 200
+        assert loads.call_count == 1
+        parsed_body = responses.calls[0].request.parsed_body  # type: ignore[attr-defined]
+        assert parsed_body.raw == body
+        assert parsed_body.decompressed == b'{"id": 1}'
+        assert parsed_body.json == {"id": 1}
+        with pytest.raises(UnicodeDecodeError):
+            parsed_body.text
+
+    run()
+    assert_reset()
+
+
+def test_parsed_body():
+    request = requests.Request(
+        "POST", "http://example.com", data={"a": "1", "b": ""}
+    ).prepare()
+    parsed_body = get_parsed_body(request)
+    assert get_parsed_body(request) is parsed_body
+    assert parsed_body.text == "a=1&b="
+    assert parsed_body.form_pairs() == [("a", "1")]
+    assert parsed_body.form_pairs(keep_blank_values=True) == [("a", "1"), ("b", "")]
+    with pytest.raises(json.JSONDecodeError):
+        parsed_body.json
+    with pytest.raises(json.JSONDecodeError):
+        parsed_body.json
+
+    # the cache is rebuilt when the body is replaced
+    request.body = "{}"
+    assert get_parsed_body(request) is not parsed_body
+    assert get_parsed_body(request).json == {}
+
+
+def test_matcher_constraints():
+    header = matchers.header_matcher({"Accept": "*/*", "X-Token": re.compile(".*")})
+    query = matchers.query_param_matcher({"page": 1}, strict_match=False)
+    json_params = matchers.json_params_matcher({"id": 1, "name": "foo"})
+
+    assert matchers.get_constraints([header]) == matchers.MatcherConstraints(
+        headers=["accept", "x-token"]
+    )
+    assert matchers.get_constraints([query]) == matchers.MatcherConstraints(
+        query=["page"]
+    )
+    assert matchers.get_constraints([json_params]) == matchers.MatcherConstraints(
+        json_keys=["id", "name"]
+    )
+    assert not matchers.get_constraints([matchers.json_params_matcher([1, 2])])
+    assert not matchers.get_constraints([matchers.query_param_matcher(None)])
+
+    combined = matchers.get_constraints([header, query, json_params, lambda r: r])
+    assert combined == matchers.MatcherConstraints(
+        headers=["Accept", "X-Token"], query=["page"], json_keys=["id", "name"]
+    )
+    assert repr(combined) == (
+        "MatcherConstraints(headers=['accept', 'x-token'], query=['page'], "
+        "json_keys=['id', 'name'])"
+    )
+
+    request = requests.Request(
+        "POST",
+        "http://example.com",
+        headers={"accept": "*/*", "X-Token": "abc"},
+        json={"id": 2, "name": "bar", "extra": True},
+    ).prepare()
+    request.params = {"page": "1"}  # type: ignore[attr-defined]
+    assert combined.satisfied_by(request)
+
+    request.params = {}  # type: ignore[attr-defined]
+    assert not combined.satisfied_by(request)
+    assert matchers.get_constraints([header]).satisfied_by(request)
+
+    request.headers.pop("X-Token")
+    assert not matchers.get_constraints([header]).satisfied_by(request)
+
+    request.body = b'{"id": 1}'
+    assert not matchers.get_constraints([json_params]).satisfied_by(request)
+    # invalid body is reported by the matcher itself
+    request.body = b"not json"
+    assert matchers.get_constraints([json_params]).satisfied_by(request)
+
+
+def test_matchers_ordered_by_cost():
+    calls = []
+
+    def slow_matcher(request):
+        calls.append("slow")
+        time.sleep(0.01)
+        return True, ""
+
+    def never_matcher(request):
+        calls.append("never")
+        return False, "never matches"
+
+    header = matchers.header_matcher({"Accept": "application/json"})
+
+    def run():
+        with responses.RequestsMock(
+            assert_all_requests_are_fired=False, order_matchers_by_cost=True
+        ) as rsps:
+            rsps.get("http://example.com", match=[slow_matcher, never_matcher])
+            rsps.get("http://example.com", match=[slow_matcher, header])
+
+            headers = {"Accept": "application/json"}
+            for _ in range(3):
+                assert requests.get("http://example.com", headers=headers).ok
+
+            # the rejecting matcher runs first once it is known
+            assert calls == ["slow", "never", "slow"] + ["never", "slow"] * 2
+            stats = rsps.matcher_stats
+            assert stats is not None
+            assert len(stats) == 3
+
+            never = stats.get(never_matcher)
+            assert never is not None
+            assert never.calls == 3
+            assert never.failures == 3
+            assert never.failure_rate == 1
+            assert never.name.endswith("never_matcher")
+            assert stats.get(slow_matcher).calls == 4
+            assert stats.get(header).failures == 0
+            assert stats.items()[0][0] is slow_matcher
+
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.get("http://example.com")
+            assert "never matches" in str(excinfo.value)
+
+            stats.reset()
+            assert stats.get(slow_matcher) is None
+
+        with responses.RequestsMock() as rsps:
+            assert rsps.matcher_stats is None
+
+    run()
+    assert_reset()
+
+
+def test_matcher_stats_order():
+    stats = matchers.MatcherStats()
+
+    def cheap(request):
+        return True, ""
+
+    def selective(request):
+        return True, ""
+
+    def unseen(request):
+        return True, ""
+
+    stats.record(cheap, True, 0.001)
+    stats.record(cheap, False, 0.001)
+    stats.record(selective, False, 0.005)
+    stats.record(selective, False, 0.005)
+    assert stats.get(cheap).rank == pytest.approx(0.002)
+    assert stats.get(selective).rank == pytest.approx(0.005)
+    assert stats.order([selective, cheap, unseen]) == [unseen, cheap, selective]
+
+    stats.record(unseen, True, 0.0)
+    assert stats.order([unseen, selective, cheap]) == [cheap, selective, unseen]
+
+
 def test_fail_matchers_error():
     """
     Validate that Exception is raised if request does not match responses.matchers
@@ -714,12 +1220,8 @@ def test_multipart_matcher_fail():
             assert "multipart/form-data doesn't match. Request body differs." in msg
 
             assert (
-                r'\r\nContent-Disposition: form-data; name="file_name"; '
-                r'filename="file_name"\r\n\r\nOld World!\r\n'
-            ) in msg
-            assert (
-                r'\r\nContent-Disposition: form-data; name="file_name"; '
-                r'filename="file_name"\r\n\r\nNew World!\r\n'
+                "Part 'file_name' (filename 'file_name') content b'New World!' "
+                "(10 bytes) isn't equal to b'Old World!' (10 bytes)"
             ) in msg
 
         # x-www-form-urlencoded request
@@ -764,6 +1266,66 @@ def test_multipart_matcher_fail():
     assert_reset()
 
 
+def test_multipart_matcher_parts():
+    def run():
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            for i in range(5):
+                rsps.post(
+                    "http://example.com",
+                    body=str(i),
+                    match=[
+                        matchers.multipart_matcher(
+                            {"upload": ("a.txt", f"file {i}", "text/plain")},
+                            data={"field": "value"},
+                        )
+                    ],
+                )
+
+            with patch(
+                "responses._request.parse_multipart", wraps=parse_multipart
+            ) as parse:
+                resp = requests.post(
+                    "http://example.com",
+                    data={"field": "value"},
+                    files={"upload": ("a.txt", "file 3", "text/plain")},
+                )
+            assert resp.text == "3"
+            assert parse.call_count == 1
+
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.post(
+                    "http://example.com",
+                    files={"upload": ("a.txt", "file 3", "text/plain")},
+                )
+            assert (
+                "Request body differs. Parts 'upload' (filename 'a.txt') aren't "
+                "equal 'field', 'upload' (filename 'a.txt')"
+            ) in str(excinfo.value)
+
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.post(
+                    "http://example.com",
+                    data={"field": "value"},
+                    files={"upload": ("a.txt", "file 3", "application/json")},
+                )
+            assert (
+                "Part 'upload' (filename 'a.txt') headers {'content-disposition': "
+                '\'form-data; name="upload"; filename="a.txt"\', '
+                "'content-type': 'application/json'} aren't equal"
+            ) in str(excinfo.value)
+
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.post(
+                    "http://example.com",
+                    data=b"not multipart",
+                    headers={"Content-Type": "multipart/form-data; boundary=x"},
+                )
+            assert "Request body is not valid multipart/form-data" in str(excinfo.value)
+
+    run()
+    assert_reset()
+
+
 def test_query_string_matcher_raises():
     """
     Validate that Exception is raised if request does not match responses.matchers
@@ -870,6 +1432,34 @@ def test_request_headers_missing_raises():
     assert_reset()
 
 
+def test_request_matches_headers_case_insensitive():
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        responses.get(
+            url,
+            body="success",
+            match=[
+                matchers.header_matcher(
+                    {"x-custom-header": "foo", "X-TOKEN": re.compile(r"\d+")}
+                )
+            ],
+        )
+
+        resp = requests.get(url, headers={"X-Custom-Header": "foo", "x-token": "42"})
+        assert resp.text == "success"
+
+        with pytest.raises(ConnectionError) as excinfo:
+            requests.get(url, headers={"X-Custom-Header": "foo", "x-token": "abc"})
+        assert (
+            "Headers do not match: {'X-Custom-Header': 'foo', 'x-token': 'abc'} "
+            "doesn't match {'x-custom-header': 'foo', 'X-TOKEN': re.compile('\\\\d+')}"
+        ) in str(excinfo.value)
+
+    run()
+    assert_reset()
+
+
 def test_request_matches_headers_strict_match():
     @responses.activate
     def run():
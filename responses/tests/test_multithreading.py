@@ -33,3 +33,62 @@ def test_multithreading_lock(execution_number):  # type: ignore[misc]
             thread.start()
         for thread in threads:
             thread.join()
+
+
+def test_multithreading_duplicates_served_once():
+    n_threads = 8
+    n_requests = 25
+    with responses.RequestsMock() as m:
+        for i in range(n_threads * n_requests):
+            m.add(url="http://example.com/example", method="GET", body=str(i))
+
+        bodies = []
+
+        def fun():
+            for _ in range(n_requests):
+                bodies.append(requests.get("http://example.com/example").text)
+
+        threads = [threading.Thread(target=fun) for _ in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(bodies, key=int) == [
+            str(i) for i in range(n_threads * n_requests)
+        ]
+
+
+@pytest.mark.parametrize("n_threads", [2, 8, 32])
+def test_multithreading_concurrent_lookups(n_threads):  # type: ignore[misc]
+    """Lookups are not serialized, so matchers of concurrent requests run in parallel.
+
+    Every request waits in the matcher until all threads have entered it, with a
+    global lock around lookups the barrier would time out.
+    """
+    n_requests = 5
+    barrier = threading.Barrier(n_threads, timeout=10)
+
+    def waiting_matcher(request):
+        barrier.wait()
+        return True, ""
+
+    with responses.RequestsMock() as m:
+        m.add(url="http://example.com/example", method="GET", match=[waiting_matcher])
+        errors = []
+
+        def fun():
+            for _ in range(n_requests):
+                try:
+                    requests.get("http://example.com/example")
+                except threading.BrokenBarrierError as exc:
+                    errors.append(exc)
+
+        threads = [threading.Thread(target=fun) for _ in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert len(m.calls) == n_threads * n_requests
@@ -1,8 +1,12 @@
+import copy
+import re
+
 import pytest
 import requests
 from requests.exceptions import ConnectionError
 
 import responses
+from responses import matchers
 from responses import registries
 from responses.registries import OrderedRegistry
 from responses.tests.test_responses import assert_reset
@@ -112,6 +116,520 @@ def test_registry_reset():
     assert_reset()
 
 
+class TestFirstMatchRegistry:
+    def test_index_keeps_registration_order(self):
+        @responses.activate
+        def run():
+            responses.get(re.compile(r"http://example\.com/\w+"), body="pattern")
+            responses.get("http://example.com/foo", body="first")
+            responses.get("http://example.com/foo", body="second")
+            responses.post("http://example.com/foo", body="post")
+
+            assert requests.get("http://example.com/foo").text == "pattern"
+            assert requests.get("http://example.com/foo").text == "first"
+            assert requests.get("http://example.com/foo").text == "second"
+            assert requests.get("http://example.com/foo").text == "second"
+            assert requests.post("http://example.com/foo").text == "post"
+
+        run()
+        assert_reset()
+
+    def test_index_normalizes_url(self):
+        @responses.activate
+        def run():
+            responses.get("http://example.com", body="root")
+            responses.get("http://example.com/foo?page=1", body="query")
+            responses.get("http://español.es/", body="unicode")
+
+            assert requests.get("http://example.com/").text == "root"
+            assert requests.get("http://example.com/foo?page=1").text == "query"
+            assert requests.get("http://español.es/").text == "unicode"
+
+        run()
+        assert_reset()
+
+    def test_index_reports_all_failed_reasons(self):
+        @responses.activate
+        def run():
+            responses.get("http://example.com/foo")
+            responses.post("http://example.com/bar")
+            responses.get(re.compile(r"http://other\.com/\w+"))
+
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.get("http://example.com/bar")
+
+            msg = str(excinfo.value)
+            assert "- GET http://example.com/foo URL does not match" in msg
+            assert "- POST http://example.com/bar Method does not match" in msg
+            assert "URL does not match" in msg.splitlines()[-1]
+
+        run()
+        assert_reset()
+
+    def test_failed_lookup_calls_matchers_once(self):
+        calls = []
+
+        def counting_matcher(request):
+            calls.append(request.url)
+            return False, "counted"
+
+        with responses.RequestsMock(order_matchers_by_cost=True) as rsps:
+            rsps.get("http://example.com/other")
+            rsps.get("http://example.com/", match=[counting_matcher])
+            rsps.get(
+                "http://example.com/",
+                match=[matchers.header_matcher({"X-Required": "1"})],
+            )
+
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.get("http://example.com/")
+
+            assert calls == ["http://example.com/"]
+            stats = rsps.matcher_stats
+            assert stats is not None
+            counted = stats.get(counting_matcher)
+            assert counted is not None
+            assert (counted.calls, counted.failures) == (1, 1)
+
+            # reasons are reported in registration order
+            lines = str(excinfo.value).splitlines()
+            assert "URL does not match" in lines[-3]
+            assert "counted" in lines[-2]
+            assert "Headers do not match" in lines[-1]
+            rsps.reset()
+
+    def test_index_after_replace_and_remove(self):
+        @responses.activate
+        def run():
+            responses.get("http://example.com/foo", body="one")
+            responses.get("http://example.com/bar", body="bar")
+            responses.replace(
+                responses.GET, re.compile("http://example.com/foo"), body="two"
+            )
+            assert requests.get("http://example.com/foo").text == "two"
+
+            responses.remove(responses.GET, "http://example.com/bar")
+            with pytest.raises(ConnectionError):
+                requests.get("http://example.com/bar")
+
+        run()
+        assert_reset()
+
+    def test_reassigned_url_and_method(self):
+        @responses.activate
+        def run():
+            rsp = responses.get("http://example.com/old", body="moved")
+            pattern = responses.get(re.compile(r"http://example\.com/a/\d"))
+            rsp.url = "http://example.com/new"
+            assert requests.get("http://example.com/new").text == "moved"
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.get("http://example.com/old")
+            assert "- GET http://example.com/new URL does not match" in str(
+                excinfo.value
+            )
+
+            rsp.method = responses.POST
+            assert requests.post("http://example.com/new").text == "moved"
+
+            pattern.url = re.compile(r"http://example\.com/b/\d")
+            assert requests.get("http://example.com/b/1").status_code == 200
+
+            # the equality index follows the new URL as well
+            assert len(responses.remove(responses.POST, "http://example.com/new")) == 1
+            assert responses.registered() == [pattern]
+
+        run()
+        assert_reset()
+
+    def test_replace_keeps_bucket_order(self):
+        @responses.activate
+        def run():
+            responses.get("http://example.com/foo", body="one")
+            responses.get("http://example.com/foo", body="two")
+            responses.replace(responses.GET, "http://example.com/foo", body="three")
+            assert requests.get("http://example.com/foo").text == "three"
+            assert requests.get("http://example.com/foo").text == "two"
+
+        run()
+        assert_reset()
+
+    @pytest.mark.parametrize(
+        "pattern,prefix",
+        [
+            (re.compile(r"http://example\.com/api/\d+"), "http://example.com/api/"),
+            (re.compile(r"^http://example\.com/(foo|bar)"), "http://example.com/"),
+            (re.compile(r"https?://example\.com"), "http"),
+            (re.compile(r"http://a\.com/x|http://b\.com/"), ""),
+            (re.compile(r"http://example\.com/[a|b]"), "http://example.com/"),
+            (re.compile(r"HTTP://example\.com/", re.IGNORECASE), ""),
+            (re.compile(r"(?i)http://example\.com/"), ""),
+            (re.compile(rb"http://example\.com/"), None),
+        ],
+    )
+    def test_literal_prefix(self, pattern, prefix):  # type: ignore[misc]
+        assert registries._literal_prefix(pattern) == prefix
+
+    def test_pattern_dispatch(self):
+        @responses.activate
+        def run():
+            responses.get(re.compile(r"http://example\.com/api/\d+"), body="api")
+            responses.get(re.compile(r"http://example\.com/(foo|bar)"), body="foo")
+            responses.get(re.compile(r".*/bar"), body="any")
+            responses.post(re.compile(r"http://example\.com/.*"), body="post")
+
+            registry = responses.mock.get_registry()
+            request = requests.Request("GET", "http://example.com/bar").prepare()
+            assert [rsp.body for rsp in registry._candidates(request)] == [
+                "foo",
+                "any",
+            ]
+
+            assert requests.get("http://example.com/api/1").text == "api"
+            assert requests.get("http://example.com/foo").text == "foo"
+            assert requests.get("http://other.com/bar").text == "any"
+            assert requests.post("http://example.com/api/1").text == "post"
+            with pytest.raises(ConnectionError):
+                requests.get("http://example.com/baz")
+
+        run()
+        assert_reset()
+
+    def test_prefix_trie(self):
+        trie = registries._PrefixTrie()
+        api = responses.Response(responses.GET, re.compile(r"http://a\.com/api/\d+"))
+        root = responses.Response(responses.GET, re.compile(r"http://a\.com/"))
+        trie.add("http://a.com/api/", api)
+        trie.add("http://a.com/", root)
+
+        assert trie.find("http://a.com/api/1") == [root, api]
+        assert trie.find("http://a.com/other") == [root]
+        assert trie.find("http://b.com/") == []
+
+        trie.remove("http://a.com/api/", api)
+        assert trie.find("http://a.com/api/1") == [root]
+        trie.remove("http://a.com/", root)
+        assert not trie._root.children
+
+    def test_add_same_instance_shares_state(self):
+        @responses.activate
+        def run():
+            body = b"x" * 1024 * 1024
+            response = responses.Response(
+                responses.GET,
+                "http://example.com/",
+                body=body,
+                headers={"X-Test": "foo"},
+                match=[matchers.header_matcher({"Accept": "*/*"})],
+            )
+            responses.add(response)
+            duplicate = responses.add(response)
+
+            assert duplicate is not response
+            assert duplicate.body is response.body
+            assert duplicate.headers is response.headers
+            assert duplicate.match is response.match
+            assert duplicate.calls is not response.calls
+
+            assert requests.get("http://example.com/").content == body
+            assert requests.get("http://example.com/").content == body
+            assert response.call_count == 1
+            assert duplicate.call_count == 1
+
+            duplicate.status = 404
+            assert response.status == 200
+
+        run()
+        assert_reset()
+
+    def test_matcher_constraints_skip_responses(self):
+        calls = []
+
+        def counting(matcher):
+            def match(request):
+                calls.append(matcher)
+                return matcher(request)
+
+            match.constraints = matcher.constraints  # type: ignore[attr-defined]
+            return match
+
+        @responses.activate
+        def run():
+            for page in range(50):
+                responses.get(
+                    "http://example.com/",
+                    body=str(page),
+                    match=[counting(matchers.query_param_matcher({"page": page}))],
+                )
+            responses.get(
+                "http://example.com/",
+                body="token",
+                match=[counting(matchers.header_matcher({"X-Token": "abc"}))],
+            )
+
+            resp = requests.get("http://example.com/", headers={"X-Token": "abc"})
+            assert resp.text == "token"
+            assert len(calls) == 1
+
+            assert requests.get("http://example.com/?page=3").text == "3"
+            assert len(calls) == 1 + 50
+
+            # skipped responses are still reported when nothing matches
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.get("http://example.com/?other=1")
+            msg = str(excinfo.value)
+            assert "Headers do not match" in msg
+            assert msg.count("Parameters do not match") == 50
+
+        run()
+        assert_reset()
+
+    def test_matchers_modified_in_place(self):
+        @responses.activate
+        def run():
+            response = responses.get(
+                "http://example.com/",
+                match=[matchers.header_matcher({"X-Token": "abc"})],
+            )
+            # constraints of the removed matcher don't apply anymore
+            response.match.clear()
+            assert requests.get("http://example.com/").status_code == 200
+
+            response.match.append(matchers.query_param_matcher({"page": "1"}))
+            with pytest.raises(ConnectionError) as excinfo:
+                requests.get("http://example.com/")
+            assert "Parameters do not match" in str(excinfo.value)
+
+        run()
+        assert_reset()
+
+    def test_remove_and_replace_equal_responses(self):
+        class AnyURL(responses.Response):
+            def __eq__(self, other):
+                return isinstance(other, responses.Response)
+
+        registry = registries.FirstMatchRegistry()
+        foo_1 = responses.Response(responses.GET, "http://example.com/foo", body="1")
+        bar = responses.Response(responses.GET, "http://example.com/bar")
+        foo_2 = responses.Response(responses.GET, "http://example.com/foo", body="2")
+        pattern = responses.Response(responses.GET, re.compile("http://example.com/"))
+        custom = AnyURL(responses.POST, "http://example.com/custom")
+        registry.add_many([foo_1, bar, foo_2, pattern, custom])
+
+        foo = responses.Response(responses.GET, "http://example.com/foo", body="3")
+        # the registered response with a custom comparison is equal as well
+        assert registry._find_equal(foo) == [foo_1, foo_2, custom]
+
+        registry.replace(foo)
+        assert registry.registered == [foo, bar, foo_2, pattern, custom]
+
+        same_pattern = responses.Response(
+            responses.GET, re.compile("http://example.com/")
+        )
+        registry.replace(same_pattern)
+        assert registry.registered == [foo, bar, foo_2, same_pattern, custom]
+
+        assert registry.remove(foo) == [foo, foo, foo]
+        assert registry.registered == [bar, same_pattern]
+        assert registry.remove(foo) == []
+
+        with pytest.raises(ValueError):
+            registry.replace(foo)
+
+        # the argument with a custom comparison is compared with every response
+        any_url = AnyURL(responses.GET, "http://other.com")
+        assert registry._find_equal(any_url) == [bar, same_pattern]
+        assert registry.remove(any_url) == [any_url, any_url]
+        assert registry.registered == []
+
+    def test_replace_with_registered_instance(self):
+        registry = registries.FirstMatchRegistry()
+        first = responses.Response(responses.GET, "http://example.com/", body="1")
+        second = responses.Response(responses.GET, "http://example.com/", body="2")
+        registry.add(first)
+        registry.add(second)
+
+        replacement = registry.replace(second)
+        assert replacement is not second
+        assert registry.registered == [replacement, second]
+        assert registry.registered[0].body == "2"
+
+        assert registry.remove(second) == [second, second]
+        assert registry.registered == []
+
+        # replacing a response with itself keeps the instance
+        registry.add(first)
+        assert registry.replace(first) is first
+        assert registry.registered[0] is first
+
+    def test_registered_is_mutable(self):
+        class PopRegistry(registries.FirstMatchRegistry):
+            def find(self, request):
+                if not self.registered:
+                    return None, []
+                return self.registered.pop(0), []
+
+        @responses.activate(registry=PopRegistry)
+        def run():
+            first = responses.get("http://example.com/", body="1")
+            responses.get("http://example.com/", body="2")
+            registered = responses.registered()
+            assert registered == [first, registered[1]]
+            assert type(copy.copy(registered)) is list
+
+            assert requests.get("http://example.com/").text == "1"
+            assert requests.get("http://example.com/").text == "2"
+            assert registered == []
+            assert responses.registered() is registered
+
+        run()
+        assert_reset()
+
+    def test_modify_registered(self):
+        registry = registries.FirstMatchRegistry()
+        first = registry.add(
+            responses.Response("GET", "http://example.com/1", body="1")
+        )
+        second = registry.add(
+            responses.Response("GET", "http://example.com/2", body="2")
+        )
+
+        # lookups use the modified list
+        registry.registered.insert(0, second)
+        assert registry.registered[:2] == [second, first]
+        # the repeated instance is registered as a copy, see `add`
+        duplicate = registry.registered[2]
+        assert duplicate is not second
+        assert duplicate.body == "2"
+        request = requests.Request("GET", "http://example.com/2").prepare()
+        assert registry.find(request) == (second, [])
+        assert registry.find(request) == (duplicate, [])
+
+        del registry.registered[:]
+        assert registry.find(request) == (None, [])
+        registry.registered.append(first)
+        assert registry.remove(first) == [first]
+        assert registry.registered == []
+
+    def test_assign_registered(self):
+        class ListRegistry(registries.FirstMatchRegistry):
+            def reset(self):
+                self.registered = []
+
+        registry = ListRegistry()
+        first = registry.add(responses.Response("GET", "http://example.com/"))
+        registered = registry.registered
+        registry.reset()
+        assert registry.registered == []
+        assert registered == [first]
+
+        registry.registered = [first]
+        request = requests.Request("GET", "http://example.com/").prepare()
+        assert registry.find(request) == (first, [])
+
+
+class TestCachingRegistry:
+    def test_repeated_requests(self):
+        calls = []
+
+        def counting(request):
+            calls.append(request)
+            return True, ""
+
+        @responses.activate(registry=registries.CachingRegistry)
+        def run():
+            registry = responses.mock.get_registry()
+            assert isinstance(registry, registries.CachingRegistry)
+            responses.get("http://example.com/other", body="other")
+            responses.get("http://example.com/", body="one", match=[counting])
+
+            for _ in range(5):
+                assert requests.get("http://example.com/").text == "one"
+            assert len(calls) == 1
+            assert (registry.hits, registry.misses) == (4, 1)
+
+            # any difference in the request is a different fingerprint
+            assert requests.get("http://example.com/", headers={"A": "b"}).ok
+            assert requests.get("http://example.com/", data=b"body").ok
+            assert requests.get("http://example.com/", timeout=3).ok
+            assert len(calls) == 4
+            assert len(responses.calls) == 8
+
+            # registry changes invalidate the cache
+            responses.replace(responses.GET, "http://example.com/", body="two")
+            assert requests.get("http://example.com/").text == "two"
+            assert registry.misses == 5
+
+        run()
+        assert_reset()
+
+    def test_modified_matchers(self):
+        @responses.activate(registry=registries.CachingRegistry)
+        def run():
+            registry = responses.mock.get_registry()
+            assert isinstance(registry, registries.CachingRegistry)
+            first = responses.get(
+                "http://example.com/",
+                body="one",
+                match=[matchers.header_matcher({"X-Token": "abc"})],
+            )
+            second = responses.get("http://example.com/", body="two")
+            assert requests.get("http://example.com/").text == "two"
+            assert requests.get("http://example.com/").text == "two"
+            assert registry.hits == 1
+
+            # matchers replaced or modified in place are evaluated again
+            second.match = [matchers.header_matcher({"X-Token": "abc"})]
+            first.match.clear()
+            assert requests.get("http://example.com/").text == "one"
+            assert requests.get("http://example.com/").text == "one"
+            assert registry.hits == 2
+
+            first.match.append(matchers.header_matcher({"X-Token": "abc"}))
+            with pytest.raises(ConnectionError):
+                requests.get("http://example.com/")
+            assert registry.hits == 2
+
+        run()
+        assert_reset()
+
+    def test_duplicates_are_not_cached(self):
+        @responses.activate(registry=registries.CachingRegistry)
+        def run():
+            responses.get("http://example.com/", body="one")
+            responses.get("http://example.com/", body="two")
+
+            assert requests.get("http://example.com/").text == "one"
+            assert requests.get("http://example.com/").text == "two"
+            assert requests.get("http://example.com/").text == "two"
+            assert requests.get("http://example.com/").text == "two"
+
+            registry = responses.mock.get_registry()
+            assert registry.hits == 2  # type: ignore[attr-defined]
+
+        run()
+        assert_reset()
+
+    def test_maxsize_and_streams(self, monkeypatch):
+        monkeypatch.setattr(registries.CachingRegistry, "maxsize", 2)
+
+        @responses.activate(registry=registries.CachingRegistry)
+        def run():
+            responses.get(re.compile("http://example.com/.*"))
+            registry = responses.mock.get_registry()
+            for path in ("a", "b", "c"):
+                requests.get(f"http://example.com/{path}")
+            assert len(registry._cache) == 2  # type: ignore[attr-defined]
+
+            requests.get("http://example.com/a", data=iter([b"chunk"]))
+            assert registry.misses == 3  # type: ignore[attr-defined]
+
+            registry.reset()
+            assert not registry._cache  # type: ignore[attr-defined]
+
+        run()
+        assert_reset()
+
+
 class TestOrderedRegistry:
     def test_invocation_index(self):
         @responses.activate(registry=OrderedRegistry)
@@ -194,3 +712,86 @@ class TestOrderedRegistry:
 
         run()
         assert_reset()
+
+    def test_registered_view(self):
+        @responses.activate(registry=OrderedRegistry)
+        def run():
+            first = responses.get("http://twitter.com/api/1/foobar", status=200)
+            second = responses.get("http://twitter.com/api/1/foobar", status=201)
+            third = responses.get("http://twitter.com/api/1/barfoo", status=202)
+            assert responses.registered() == [first, second, third]
+
+            requests.get("http://twitter.com/api/1/foobar")
+            assert responses.registered() == [second, third]
+            assert responses.registered()[0] is second
+
+            responses.mock.get_registry().reset()
+            assert responses.registered() == []
+
+        run()
+        assert_reset()
+
+    def test_modify_registered(self):
+        registry = OrderedRegistry()
+        first = registry.add(responses.Response("GET", "http://example.com/1"))
+        second = registry.add(responses.Response("GET", "http://example.com/2"))
+        registry.registered.reverse()
+        assert registry.registered == [second, first]
+
+        request = requests.Request("GET", "http://example.com/2").prepare()
+        assert registry.find(request) == (second, [])
+        assert registry.registered == [first]
+
+    def test_add_same_instance(self):
+        @responses.activate(registry=OrderedRegistry)
+        def run():
+            response = responses.Response(
+                responses.GET, "http://twitter.com/api/1/foobar"
+            )
+            responses.add(response)
+            responses.add(response)
+            registered = responses.registered()
+            assert registered[0] is response
+            assert registered[1] is not response
+
+            requests.get("http://twitter.com/api/1/foobar")
+            requests.get("http://twitter.com/api/1/foobar")
+            assert not responses.registered()
+
+        run()
+        assert_reset()
+
+    def test_remove_and_replace(self):
+        @responses.activate(registry=OrderedRegistry)
+        def run():
+            responses.get("http://twitter.com/api/1/foobar", status=200)
+            responses.get("http://twitter.com/api/1/barfoo", status=201)
+            responses.get("http://twitter.com/api/1/foobar", status=202)
+
+            removed = responses.remove(responses.GET, "http://twitter.com/api/1/foobar")
+            assert len(removed) == 2
+            assert len(responses.registered()) == 1
+
+            responses.replace(
+                responses.GET, "http://twitter.com/api/1/barfoo", status=203
+            )
+            resp = requests.get("http://twitter.com/api/1/barfoo")
+            assert resp.status_code == 203
+
+        run()
+        assert_reset()
+
+    def test_long_sequence(self):
+        @responses.activate(registry=OrderedRegistry)
+        def run():
+            for i in range(1000):
+                responses.get(f"http://twitter.com/api/{i}", status=200 + i % 100)
+
+            for i in range(1000):
+                resp = requests.get(f"http://twitter.com/api/{i}")
+                assert resp.status_code == 200 + i % 100
+
+            assert not responses.registered()
+
+        run()
+        assert_reset()
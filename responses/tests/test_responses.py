@@ -1,10 +1,14 @@
 import inspect
+import json
+import math
 import os
 import re
 import tempfile
+import time
 import warnings
 from io import BufferedReader
 from io import BytesIO
+from pathlib import Path
 from typing import Any
 from typing import List
 from typing import Optional
@@ -16,7 +20,9 @@ import requests
 import urllib3
 from requests.exceptions import ChunkedEncodingError
 from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectTimeout
 from requests.exceptions import HTTPError
+from requests.exceptions import ReadTimeout
 from requests.exceptions import RetryError
 from urllib3.util.retry import Retry
 
@@ -1506,6 +1512,185 @@ def test_stream_with_none_chunk_size():
     assert_reset()
 
 
+def test_iterable_body_is_streamed():
+    produced = []
+    closed = []
+
+    def feed():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield b'{"id": %d}\n' % i
+        finally:
+            closed.append(True)
+
+    @responses.activate
+    def run():
+        url = "http://example.com/feed"
+        responses.get(url, body=feed)
+        resp = requests.get(url, stream=True)
+        assert resp.headers["Transfer-Encoding"] == "chunked"
+        assert "Content-Length" not in resp.headers
+
+        lines = resp.iter_lines()
+        assert next(lines) == b'{"id": 0}'
+        # chunks are produced while the body is read
+        assert len(produced) < 1000
+        # closing the response closes the generator
+        resp.close()
+        assert closed == [True]
+
+        resp = requests.get(url, stream=True)
+        assert sum(1 for _ in resp.iter_lines()) == 1000
+
+    run()
+    assert_reset()
+
+
+def test_iterable_body_chunks():
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        responses.get(url, body=["ünï", b"", b"code"])
+        resp = requests.get(url)
+        assert resp.content == "ünïcode".encode("utf-8")
+
+        resp = requests.get(url, stream=True)
+        assert b"".join(resp.iter_content(None)) == "ünïcode".encode("utf-8")
+
+    run()
+    assert_reset()
+
+
+def test_body_types():
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        responses.get(url, body=memoryview(b"view"))
+        assert requests.get(url).content == b"view"
+
+        responses.replace(responses.GET, url, body=[b"ok", 1])  # type: ignore[list-item]
+        with pytest.raises(TypeError, match="must be bytes or str, not int"):
+            requests.get(url)
+
+        responses.replace(responses.GET, url, body={"a": 1})
+        with pytest.raises(TypeError, match="not dict"):
+            requests.get(url)
+
+        responses.add_callback(responses.POST, url, lambda request: (200, {}, {"a": 1}))
+        with pytest.raises(TypeError, match="not dict"):
+            requests.post(url)
+
+    run()
+    assert_reset()
+
+
+def test_iterable_body_factory():
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        responses.get(url, body=lambda: (b"chunk" for _ in range(3)))
+        # a factory creates new chunks for every call
+        assert requests.get(url).content == b"chunk" * 3
+        assert requests.get(url).content == b"chunk" * 3
+
+    run()
+    assert_reset()
+
+
+def test_callback_generator_body():
+    def request_callback(request):
+        return 200, {"Content-Length": "10"}, (b"x" for _ in range(10))
+
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        responses.add_callback(responses.GET, url, request_callback)
+        resp = requests.get(url, stream=True)
+        assert "Transfer-Encoding" not in resp.headers
+        assert list(resp.iter_content(4)) == [b"xxxx", b"xxxx", b"xx"]
+
+    run()
+    assert_reset()
+
+
+def test_file_body_is_memory_mapped(tmp_path: Path) -> None:
+    fixture = tmp_path / "model.bin"
+    content = bytes(range(256)) * 1000
+    fixture.write_bytes(content)
+
+    @responses.activate
+    def run():
+        url = "http://example.com/model.bin"
+        response = responses.get(url, body=fixture, auto_calculate_content_length=True)
+
+        first = requests.get(url, stream=True)
+        second = requests.get(url, stream=True)
+        # every call reads the shared mapping at its own position
+        assert first.raw.read(10) == content[:10]
+        assert second.raw.read(20) == content[:20]
+        assert first.raw.read() == content[10:]
+        assert second.raw.read() == content[20:]
+
+        resp = requests.get(url, stream=True)
+        assert b"".join(resp.iter_content(None)) == content
+
+        mapping = response._get_encoded_body()
+        resp = requests.get(url)
+        assert resp.content == content
+        assert resp.headers["Content-Length"] == str(len(content))
+        assert response._get_encoded_body() is mapping
+
+        empty = tmp_path / "empty.bin"
+        empty.write_bytes(b"")
+        response.body = empty
+        assert requests.get(url).content == b""
+
+    run()
+    assert_reset()
+
+
+def test_file_body_rewritten(tmp_path: Path) -> None:
+    fixture = tmp_path / "model.bin"
+    fixture.write_bytes(b"x" * 100_000)
+
+    @responses.activate
+    def run():
+        url = "http://example.com/model.bin"
+        response = responses.get(url, body=fixture, auto_calculate_content_length=True)
+        assert requests.get(url).content == b"x" * 100_000
+        mapping = response._get_encoded_body()
+
+        # a truncated file is mapped again instead of reading the stale mapping
+        fixture.write_bytes(b"short")
+        resp = requests.get(url)
+        assert resp.content == b"short"
+        assert resp.headers["Content-Length"] == "5"
+        assert response._get_encoded_body() is not mapping
+
+        fixture.write_bytes(b"")
+        assert requests.get(url).content == b""
+        fixture.write_bytes(b"grown")
+        assert requests.get(url).content == b"grown"
+
+    run()
+    assert_reset()
+
+
+def test_callback_file_body(tmp_path: Path) -> None:
+    fixture = tmp_path / "data.bin"
+    fixture.write_bytes(b"data")
+
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        responses.add_callback(responses.GET, url, lambda request: (200, {}, fixture))
+        assert requests.get(url).content == b"data"
+
+    run()
+    assert_reset()
+
+
 def test_legacy_adding_headers():
     @responses.activate
     def run():
@@ -1631,6 +1816,69 @@ def test_auto_calculate_content_length_doesnt_work_for_buffered_reader_body():
     assert_reset()
 
 
+def test_body_encoded_once():
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        response = responses.get(
+            url, body="ünïcode" * 1000, auto_calculate_content_length=True
+        )
+
+        first = response.get_response(requests.Request("GET", url).prepare())
+        encoded = response._get_encoded_body()
+        assert encoded == ("ünïcode" * 1000).encode("utf-8")
+        assert response._get_encoded_body() is encoded
+        assert first.headers["Content-Length"] == str(len(encoded))
+
+        resp = requests.get(url)
+        assert resp.content == encoded
+        assert requests.get(url).content == encoded
+
+        # reassigning the body invalidates the encoded body
+        response.body = b"bytes"
+        resp = requests.get(url)
+        assert resp.content == b"bytes"
+        assert resp.headers["Content-Length"] == "5"
+
+    run()
+    assert_reset()
+
+
+def test_headers_computed_once():
+    @responses.activate
+    def run():
+        url = "http://example.com/"
+        response = responses.get(
+            url,
+            headers={"X-Test": "foo"},
+            content_type="application/json",
+            auto_calculate_content_length=True,
+        )
+
+        resp = requests.get(url)
+        assert resp.headers["X-Test"] == "foo"
+        assert resp.headers["Content-Type"] == "application/json"
+        cached = response._headers_cache
+        assert cached is not None
+        # the Content-Length added to the call doesn't leak into the cached headers
+        assert "Content-Length" not in cached
+
+        requests.get(url)
+        assert response._headers_cache is cached
+
+        # reassigning headers or content_type invalidates the computed headers
+        response.headers = {"X-Test": "bar"}
+        resp = requests.get(url)
+        assert resp.headers["X-Test"] == "bar"
+
+        response.content_type = "text/html"
+        resp = requests.get(url)
+        assert resp.headers["Content-Type"] == "text/html"
+
+    run()
+    assert_reset()
+
+
 def test_auto_calculate_content_length_doesnt_override_existing_value():
     @responses.activate
     def run():
@@ -2286,6 +2534,266 @@ def test_mocked_responses_list_registered():
     assert_reset()
 
 
+@pytest.mark.parametrize(
+    "registry", [registries.FirstMatchRegistry, registries.OrderedRegistry]
+)
+def test_add_many(registry):  # type: ignore[misc]
+    @responses.activate(registry=registry)
+    def run():
+        response = Response(responses.GET, "http://example.com/", body="first")
+        responses.add(response)
+        added = responses.add_many(
+            [
+                response,
+                {"method": "GET", "url": "http://example.com/", "body": "second"},
+                {
+                    "method": responses.POST,
+                    "url": "http://example.com/",
+                    "json": {"id": 1},
+                    "status": 201,
+                },
+            ]
+        )
+
+        assert len(added) == 3
+        assert added[0] is not response
+        assert added[0] == response
+        assert responses.registered() == [response] + added
+
+        assert requests.get("http://example.com/").text == "first"
+        assert requests.get("http://example.com/").text == "first"
+        assert requests.get("http://example.com/").text == "second"
+        resp = requests.post("http://example.com/")
+        assert resp.status_code == 201
+        assert resp.json() == {"id": 1}
+
+    run()
+    assert_reset()
+
+
+@pytest.mark.parametrize(
+    "registry", [registries.FirstMatchRegistry, registries.OrderedRegistry]
+)
+def test_add_many_calls_overridden_add(registry, tmp_path):  # type: ignore[misc]
+    added = []
+
+    class CustomRegistry(registry):  # type: ignore[misc,valid-type]
+        def add(self, response):
+            added.append(response.url)
+            return super().add(response)
+
+    file_path = tmp_path / "responses.yaml"
+    file_path.write_text(
+        "responses:\n"
+        "- response:\n"
+        "    method: GET\n"
+        "    url: http://example.com/file\n"
+        "    body: from file\n"
+        "    status: 200\n"
+        "    content_type: text/plain\n"
+        "    auto_calculate_content_length: false\n"
+    )
+
+    @responses.activate(registry=CustomRegistry)
+    def run():
+        responses.add_many(
+            [
+                {"method": "GET", "url": "http://example.com/1"},
+                Response(responses.GET, "http://example.com/2"),
+            ]
+        )
+        responses._add_from_file(file_path=file_path)
+        assert added == [
+            "http://example.com/1",
+            "http://example.com/2",
+            "http://example.com/file",
+        ]
+        assert len(responses.registered()) == 3
+        responses.mock.get_registry().reset()
+
+    run()
+    assert_reset()
+
+
+def test_add_many_validates_arguments():
+    @responses.activate
+    def run():
+        with pytest.raises(RuntimeError):
+            responses.add_many(
+                [
+                    {
+                        "method": "GET",
+                        "url": "http://example.com/",
+                        "content_type": "text/plain",
+                        "headers": {"Content-Type": "text/plain"},
+                    }
+                ]
+            )
+        assert not responses.registered()
+
+    run()
+    assert_reset()
+
+
+class TestNetworkConditions:
+    def test_latency_and_jitter(self):
+        jitter = Mock(return_value=0.05)
+
+        @responses.activate
+        def run():
+            url = "http://example.com/"
+            responses.get(
+                url,
+                body="test",
+                network_conditions=responses.NetworkConditions(
+                    connect_latency=0.05, latency=0.05, jitter=jitter
+                ),
+            )
+            started = time.monotonic()
+            resp = requests.get(url, timeout=1)
+            assert time.monotonic() - started >= 0.15
+            assert resp.text == "test"
+            assert jitter.call_count == 1
+
+        run()
+        assert_reset()
+
+    def test_bandwidth(self):
+        content = b"x" * 2000
+
+        @responses.activate
+        def run():
+            url = "http://example.com/"
+            responses.get(
+                url,
+                body=content,
+                network_conditions=responses.NetworkConditions(bandwidth=10000),
+            )
+            started = time.monotonic()
+            resp = requests.get(url, stream=True)
+            assert list(resp.iter_content(1000)) == [b"x" * 1000, b"x" * 1000]
+            assert time.monotonic() - started >= 0.2
+
+        run()
+        assert_reset()
+
+    def test_read_timeout(self):
+        @responses.activate
+        def run():
+            url = "http://example.com/"
+            responses.get(
+                url, network_conditions=responses.NetworkConditions(latency=10)
+            )
+            started = time.monotonic()
+            with pytest.raises(ReadTimeout) as excinfo:
+                requests.get(url, timeout=0.01)
+            assert time.monotonic() - started < 10
+            assert excinfo.value.request.url == url
+            assert responses.calls[0].response is excinfo.value
+
+            # the read timeout is not set
+            responses.get(
+                url,
+                network_conditions=responses.NetworkConditions(latency=0.01),
+            )
+            assert requests.get(url, timeout=(0.01, None)).status_code == 200
+            timeout = urllib3.Timeout(connect=0.01)
+            assert requests.get(url, timeout=timeout)  # type: ignore[arg-type]
+
+        run()
+        assert_reset()
+
+    def test_connect_timeout(self):
+        @responses.activate
+        def run():
+            url = "http://example.com/"
+            responses.add_callback(
+                responses.GET,
+                url,
+                lambda request: (200, {}, "test"),
+                network_conditions=responses.NetworkConditions(connect_latency=10),
+            )
+            with pytest.raises(ConnectTimeout):
+                requests.get(url, timeout=(0.01, 10))
+
+        run()
+        assert_reset()
+
+    def test_mock_default(self):
+        slow = responses.NetworkConditions(latency=10)
+        with responses.RequestsMock(network_conditions=slow) as m:
+            m.get("http://example.com/slow")
+            m.get(
+                "http://example.com/fast",
+                network_conditions=responses.NetworkConditions(),
+            )
+            with pytest.raises(ReadTimeout):
+                requests.get("http://example.com/slow", timeout=0.01)
+            # the conditions of the response take precedence
+            assert requests.get("http://example.com/fast", timeout=0.01)
+
+
+class TestJSONBackend:
+    def teardown_method(self):
+        responses.set_json_backend(None)
+
+    def test_stdlib(self):
+        backend = responses.set_json_backend("json")
+        assert responses.get_json_backend() is backend
+        assert backend.name == "json"
+
+        @responses.activate
+        def run():
+            responses.post(
+                "http://example.com",
+                json={"response": "é"},
+                match=[matchers.json_params_matcher({"request": 1})],
+            )
+            resp = requests.post("http://example.com", json={"request": 1})
+            assert resp.content == b'{"response": "\\u00e9"}'
+
+        run()
+        assert_reset()
+
+    def test_custom(self):
+        dumps = Mock(return_value='{"custom": true}')
+        loads = Mock(return_value={"request": 1})
+        responses.set_json_backend(responses.JSONBackend("custom", dumps, loads))
+
+        @responses.activate
+        def run():
+            responses.post(
+                "http://example.com",
+                json={"response": 1},
+                match=[matchers.json_params_matcher({"request": 1})],
+            )
+            resp = requests.post("http://example.com", data="anything")
+            assert resp.json() == {"custom": True}
+
+        run()
+        assert_reset()
+        dumps.assert_called_once_with({"response": 1})
+        loads.assert_called_once_with("anything")
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            responses.set_json_backend("unknown")
+
+    def test_orjson(self):
+        pytest.importorskip("orjson")
+        detected = responses.set_json_backend(None)
+        assert detected.name == "orjson (decode only)"
+        # encoding with the standard library by default keeps the bodies unchanged
+        assert detected.dumps({"a": 1}) == '{"a": 1}'
+        assert math.isnan(detected.loads("NaN"))
+        assert detected.loads(str(2**70)) == 2**70
+
+        backend = responses.set_json_backend("orjson")
+        assert backend.dumps({"a": "é"}) == '{"a":"é"}'
+        with pytest.raises(json.JSONDecodeError):
+            backend.loads("{")
+
+
 @pytest.mark.parametrize(
     "url,other_url",
     [
@@ -2306,6 +2814,58 @@ def test_rfc_compliance(url, other_url):  # type: ignore[misc]
     assert_reset()
 
 
+def test_url_and_path_cached():
+    response = Response(responses.GET, "http://www.संजाल.भारत/hi")
+    request = requests.Request("GET", "http://www.संजाल.भारत/hi").prepare()
+
+    assert response._url_and_path is None
+    assert response.matches(request) == (True, "")
+    cached = response._url_and_path
+    assert cached == "http://www.xn--i1b6c4cva6a.xn--h2brj9c/hi"
+    assert response.matches(request) == (True, "")
+    assert response._url_and_path is cached
+
+    response.url = "http://example.com"
+    assert response._url_and_path is None
+    assert response.matches(request) == (False, "URL does not match")
+    assert response._url_and_path == "http://example.com"
+
+
+def test_request_url_parsed_once():
+    from responses import _request
+
+    @responses.activate
+    def run():
+        for i in range(10):
+            responses.get(f"http://example.com/{i}")
+            responses.get(
+                "http://example.com/path",
+                match=[
+                    matchers.query_string_matcher(f"page={i}"),
+                    matchers.fragment_identifier_matcher(f"section={i}"),
+                ],
+            )
+        responses.get(re.compile(r"http://example\.com/\w+"), body="pattern")
+
+        with patch.object(
+            _request, "_get_url_and_path", wraps=_request._get_url_and_path
+        ) as mock_get_url_and_path:
+            resp = requests.get("http://example.com/path?page=10#section=10")
+
+        assert resp.text == "pattern"
+        assert mock_get_url_and_path.call_count == 1
+
+        parsed_url = responses.calls[0].request.parsed_url  # type: ignore[attr-defined]
+        assert parsed_url == "http://example.com/path?page=10#section=10"
+        assert parsed_url.url_and_path == "http://example.com/path"
+        assert parsed_url.query == "page=10"
+        assert parsed_url.fragment == "section=10"
+        assert parsed_url.host == "example.com"
+
+    run()
+    assert_reset()
+
+
 def test_requests_between_add():
     @responses.activate
     def run():